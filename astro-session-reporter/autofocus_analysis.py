@@ -29,49 +29,52 @@ OUTPUT_CSV_FILES = {
     'logging': 'logging_events.csv'
 }
 
-# Compile regex patterns for each event type
-REGEX_PATTERNS = {
-    'autofocus_begin': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoFocus\|Begin\] (.+)'),
-    'autofocus_end_success': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Auto focus succeeded, the focused position is (\d+)'),
-    'autofocus_end_failure': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoFocus\|End\] Auto focus failed'),
+# Regex sources for each event type. They are compiled as bytes patterns below so
+# log lines can be matched without decoding every line to str first.
+_PATTERN_SOURCES = {
+    'autofocus_begin': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoFocus\|Begin\] (.+)',
+    'autofocus_end_success': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Auto focus succeeded, the focused position is (\d+)',
+    'autofocus_end_failure': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoFocus\|End\] Auto focus failed',
 
-    'autorun_begin': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Autorun\|Begin\] (.+)'),
-    'autorun_end': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Autorun\|End\] (.+)'),
+    'autorun_begin': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Autorun\|Begin\] (.+)',
+    'autorun_end': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Autorun\|End\] (.+)',
 
-    'target_coordinates': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Target RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+")'),
+    'target_coordinates': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Target RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+")',
 
-    'tracking_start': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Start Tracking'),
-    'tracking_stop': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Stop Tracking'),
+    'tracking_start': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Start Tracking',
+    'tracking_stop': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Stop Tracking',
 
-    'guide_stop_guiding': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Stop Guiding'),
-    'guide_start_guiding': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Start Guiding'),
-    'guide_star_lost': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Guide star lost'),
-    'guide_reselect_star': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] ReSelect Guide star'),
-    'guide_settle': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Guide Settle'),
-    'guide_settle_done': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Settle Done'),
-    'guide_settle_failed': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Settle failed'),
-    'guide_select_failed': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Select Guide Star failed, no star found'),
+    'guide_stop_guiding': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Stop Guiding',
+    'guide_start_guiding': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Start Guiding',
+    'guide_star_lost': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Guide star lost',
+    'guide_reselect_star': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] ReSelect Guide star',
+    'guide_settle': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Guide Settle',
+    'guide_settle_done': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Settle Done',
+    'guide_settle_failed': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Settle failed',
+    'guide_select_failed': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Guide\] Select Guide Star failed, no star found',
 
-    'exposure': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Exposure (\d+\.\d+)s image (\d+)#'),
+    'exposure': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Exposure (\d+\.\d+)s image (\d+)#',
 
-    'plate_solve_begin': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Plate Solve'),
-    'plate_solve_success': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Solve succeeded: RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+") Angle = ([\d\.]+), Star number = (\d+)'),
+    'plate_solve_begin': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Plate Solve',
+    'plate_solve_success': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Solve succeeded: RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+") Angle = ([\d\.]+), Star number = (\d+)',
 
-    'meridian_flip_begin': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Meridian Flip\|Begin\] (.+)'),
-    'meridian_flip_start': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Meridian Flip (\d+)# Start'),
-    'meridian_flip_end': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Meridian Flip\|End\] (.+)'),
+    'meridian_flip_begin': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Meridian Flip\|Begin\] (.+)',
+    'meridian_flip_start': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Meridian Flip (\d+)# Start',
+    'meridian_flip_end': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[Meridian Flip\|End\] (.+)',
 
-    'auto_center_begin': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoCenter\|Begin\] Auto-Center (\d+)#'),
-    'auto_center_end': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoCenter\|End\] (.+)'),
+    'auto_center_begin': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoCenter\|Begin\] Auto-Center (\d+)#',
+    'auto_center_end': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) .*?\[AutoCenter\|End\] (.+)',
 
-    'mount_slew': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Mount slews to target position: RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+")'),
+    'mount_slew': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) Mount slews to target position: RA:(\d+h\d+m\d+s) DEC:([+-]\d+°\d+\'\d+")',
 
-    'wait_message': re.compile(r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) (Wait .*?)'),
+    'wait_message': r'(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}) (Wait .*?)',
 
-    'logging_enabled': re.compile(r'Log enabled at (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})'),
-    'logging_disabled': re.compile(r'Log disabled at (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})')
+    'logging_enabled': r'Log enabled at (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})',
+    'logging_disabled': r'Log disabled at (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})'
 }
 
+REGEX_PATTERNS = {key: re.compile(src.encode('utf-8')) for key, src in _PATTERN_SOURCES.items()}
+
 # Initialize data containers for each event type
 EVENT_DATA = {
     'autofocus': [],
@@ -88,6 +91,119 @@ EVENT_DATA = {
     'logging': []
 }
 
+def _group(match, idx):
+    """Decode a single captured group from a bytes match."""
+    return match.group(idx).decode('utf-8', errors='replace')
+
+# Event table driving the generated line parser. Order matters: the first
+# matching entry wins, exactly like the original if/continue chain.
+# Each entry: (pattern key, event type, literal prefilter, {column: expression}),
+# where expressions are evaluated against the match object ``m``.
+_EVENT_SPECS = [
+    ('autofocus_begin', 'autofocus', b'[AutoFocus|Begin] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Begin'", 'Details': '_g(m, 2)',
+      'Final_Focus_Position': 'pd.NA', 'Status': "'N/A'"}),
+    ('autofocus_end_success', 'autofocus', b' Auto focus succeeded, the focused position is ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'End'", 'Details': "'Autofocus Succeeded'",
+      'Final_Focus_Position': '_g(m, 2)', 'Status': "'Success'"}),
+    ('autofocus_end_failure', 'autofocus', b'[AutoFocus|End] Auto focus failed',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'End'", 'Details': "'Autofocus Failed'",
+      'Final_Focus_Position': 'pd.NA', 'Status': "'Failure'"}),
+
+    ('autorun_begin', 'autorun', b'[Autorun|Begin] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Begin'", 'Details': '_g(m, 2)'}),
+    ('autorun_end', 'autorun', b'[Autorun|End] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'End'", 'Details': '_g(m, 2)'}),
+
+    ('target_coordinates', 'target_coordinates', b' Target RA:',
+     {'Timestamp': '_g(m, 1)', 'RA': '_g(m, 2)', 'DEC': '_g(m, 3)'}),
+
+    ('tracking_start', 'tracking', b' Start Tracking',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Start'"}),
+    ('tracking_stop', 'tracking', b' Stop Tracking',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Stop'"}),
+
+    ('guide_stop_guiding', 'guide', b'[Guide] Stop Guiding',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Stop Guiding'", 'Details': "''"}),
+    ('guide_start_guiding', 'guide', b'[Guide] Start Guiding',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Start Guiding'", 'Details': "''"}),
+    ('guide_star_lost', 'guide', b'[Guide] Guide star lost',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Guide Star Lost'", 'Details': "''"}),
+    ('guide_reselect_star', 'guide', b'[Guide] ReSelect Guide star',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'ReSelect Guide Star'", 'Details': "''"}),
+    ('guide_settle', 'guide', b'[Guide] Guide Settle',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Guide Settle'", 'Details': "''"}),
+    ('guide_settle_done', 'guide', b'[Guide] Settle Done',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Settle Done'", 'Details': "''"}),
+    ('guide_settle_failed', 'guide', b'[Guide] Settle failed',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Settle Failed'", 'Details': "''"}),
+    ('guide_select_failed', 'guide', b'[Guide] Select Guide Star failed, no star found',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Select Guide Star Failed'", 'Details': "'no star found'"}),
+
+    ('exposure', 'exposure', b' Exposure ',
+     {'Timestamp': '_g(m, 1)', 'Exposure_s': '_g(m, 2)', 'Image_Num': '_g(m, 3)'}),
+
+    ('plate_solve_begin', 'plate_solve', b' Plate Solve',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Begin'",
+      'RA': 'pd.NA', 'DEC': 'pd.NA', 'Angle': 'pd.NA', 'Star_Count': 'pd.NA'}),
+    ('plate_solve_success', 'plate_solve', b' Solve succeeded: RA:',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Success'", 'RA': '_g(m, 2)',
+      'DEC': '_g(m, 3)', 'Angle': '_g(m, 4)', 'Star_Count': '_g(m, 5)'}),
+
+    ('meridian_flip_begin', 'meridian_flip', b'[Meridian Flip|Begin] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Begin'", 'Details': '_g(m, 2)'}),
+    ('meridian_flip_start', 'meridian_flip', b' Meridian Flip ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Start Action'", 'Details': "'Flip #' + _g(m, 2)"}),
+    ('meridian_flip_end', 'meridian_flip', b'[Meridian Flip|End] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'End'", 'Details': '_g(m, 2)'}),
+
+    ('auto_center_begin', 'auto_center', b'[AutoCenter|Begin] Auto-Center ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Begin'", 'Details': "'Auto-Center #' + _g(m, 2)"}),
+    ('auto_center_end', 'auto_center', b'[AutoCenter|End] ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'End'", 'Details': '_g(m, 2)'}),
+
+    ('mount_slew', 'mount_slew', b' Mount slews to target position: RA:',
+     {'Timestamp': '_g(m, 1)', 'RA': '_g(m, 2)', 'DEC': '_g(m, 3)'}),
+
+    ('wait_message', 'wait', b' Wait ',
+     {'Timestamp': '_g(m, 1)', 'Message': '_g(m, 2)'}),
+
+    ('logging_enabled', 'logging', b'Log enabled at ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Enabled'"}),
+    ('logging_disabled', 'logging', b'Log disabled at ',
+     {'Timestamp': '_g(m, 1)', 'Event_Type': "'Disabled'"}),
+]
+
+def _build_line_parser(specs):
+    """
+    Generate one straight-line parser function from the event table.
+
+    Instead of walking the table for every log line, the table is unrolled once
+    at import into plain Python source (cheap substring prefilter, regex search,
+    dict append) and compiled with exec.
+
+    Returns:
+        tuple: (parser function, generated source). The parser is called as
+        ``_parse_line(line, emit)`` where ``emit`` maps event types to list.append.
+    """
+    namespace = {'_g': _group, 'pd': pd}
+    src_lines = ['def _parse_line(line, emit):']
+    for key, event_type, literal, columns in specs:
+        namespace[f'_search_{key}'] = REGEX_PATTERNS[key].search
+        row = ', '.join(f'{col!r}: {expr}' for col, expr in columns.items())
+        src_lines += [
+            f'    if {literal!r} in line:',
+            f'        m = _search_{key}(line)',
+            '        if m:',
+            f'            emit[{event_type!r}]({{{row}}})',
+            '            return',
+        ]
+    source = '\n'.join(src_lines) + '\n'
+    exec(compile(source, '<autofocus_analysis._parse_line>', 'exec'), namespace)
+    return namespace['_parse_line'], source
+
+_parse_line, _PARSER_SOURCE = _build_line_parser(_EVENT_SPECS)
+
 def parse_log_file_to_data_lists(file_path):
     """
     Parses a single log file to extract various events into lists of dicts.
@@ -102,238 +218,12 @@ def parse_log_file_to_data_lists(file_path):
     # Use a copy of OUTPUT_CSV_FILES keys to define the structure for event data lists
     local_event_data_keys = list(OUTPUT_CSV_FILES.keys()) 
     local_event_data = {key: [] for key in local_event_data_keys}
+    emit = {key: data_list.append for key, data_list in local_event_data.items()}
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as file: # Added encoding
+        with open(file_path, 'rb') as file: # Bytes mode: only captured groups get decoded
             for line in file:
-                # Autofocus Begin
-                match = REGEX_PATTERNS['autofocus_begin'].search(line)
-                if match:
-                    local_event_data['autofocus'].append({
-                        'Timestamp': match.group(1), # Changed to Timestamp for consistency
-                        'Event_Type': 'Begin',      # Changed to Event_Type
-                        'Details':    match.group(2),
-                        'Final_Focus_Position': pd.NA, # Use pd.NA for missing
-                        'Status': 'N/A' # Status captured by Event_Type
-                    })
-                    continue
-
-                # Autofocus End Success
-                match = REGEX_PATTERNS['autofocus_end_success'].search(line)
-                if match:
-                    local_event_data['autofocus'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'End',
-                        'Details':    'Autofocus Succeeded',
-                        'Final_Focus_Position': match.group(2),
-                        'Status':               'Success'
-                    })
-                    continue
-
-                # Autofocus End Failure
-                match = REGEX_PATTERNS['autofocus_end_failure'].search(line)
-                if match:
-                    local_event_data['autofocus'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'End',
-                        'Details':    'Autofocus Failed',
-                        'Final_Focus_Position': pd.NA,
-                        'Status':               'Failure'
-                    })
-                    continue
-
-                # Autorun Begin
-                match = REGEX_PATTERNS['autorun_begin'].search(line)
-                if match:
-                    local_event_data['autorun'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'Begin',
-                        'Details':    match.group(2)
-                    })
-                    continue
-
-                # Autorun End
-                match = REGEX_PATTERNS['autorun_end'].search(line)
-                if match:
-                    local_event_data['autorun'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'End',
-                        'Details':  match.group(2)
-                    })
-                    continue
-                
-                match = REGEX_PATTERNS['target_coordinates'].search(line)
-                if match:
-                    # Ensure 'target_coordinates' key exists if it was missed in OUTPUT_CSV_FILES based init
-                    if 'target_coordinates' not in local_event_data: 
-                        local_event_data['target_coordinates'] = []
-                    local_event_data['target_coordinates'].append({
-                        'Timestamp': match.group(1),
-                        'RA':        match.group(2),
-                        'DEC':       match.group(3)
-                    })
-                    continue
-                
-                # Tracking Start
-                match = REGEX_PATTERNS['tracking_start'].search(line)
-                if match:
-                    local_event_data['tracking'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'Start'
-                    })
-                    continue
-
-                # Tracking Stop
-                match = REGEX_PATTERNS['tracking_stop'].search(line)
-                if match:
-                    local_event_data['tracking'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'Stop'
-                    })
-                    continue
-
-                # Guide Events
-                for guide_event_key, guide_event_name in [
-                    ('guide_stop_guiding', 'Stop Guiding'),
-                    ('guide_start_guiding', 'Start Guiding'),
-                    ('guide_star_lost', 'Guide Star Lost'),
-                    ('guide_reselect_star', 'ReSelect Guide Star'),
-                    ('guide_settle', 'Guide Settle'),
-                    ('guide_settle_done', 'Settle Done'),
-                    ('guide_settle_failed', 'Settle Failed'),
-                    ('guide_select_failed', 'Select Guide Star Failed')
-                ]:
-                    match = REGEX_PATTERNS[guide_event_key].search(line)
-                    if match:
-                        details = match.group(2) if len(match.groups()) > 1 else ''
-                        if guide_event_key == 'guide_select_failed': details = 'no star found' # specific detail
-                        local_event_data['guide'].append({
-                            'Timestamp':  match.group(1),
-                            'Event_Type': guide_event_name,
-                            'Details':    details
-                        })
-                        break # Found a guide event, move to next line
-                if match: continue # If any guide event matched and broke inner loop
-
-                # Exposure
-                match = REGEX_PATTERNS['exposure'].search(line)
-                if match:
-                    local_event_data['exposure'].append({
-                        'Timestamp':   match.group(1),
-                        'Exposure_s': match.group(2), # Renamed for clarity
-                        'Image_Num':   match.group(3)  # Renamed for clarity
-                    })
-                    continue
-
-                # Plate Solve Begin
-                match = REGEX_PATTERNS['plate_solve_begin'].search(line)
-                if match:
-                    local_event_data['plate_solve'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'Begin',
-                        'RA': pd.NA, 'DEC': pd.NA, 'Angle': pd.NA, 'Star_Count': pd.NA 
-                    })
-                    continue
-                
-                # Plate Solve Success
-                match = REGEX_PATTERNS['plate_solve_success'].search(line)
-                if match:
-                    local_event_data['plate_solve'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'Success',
-                        'RA':         match.group(2),
-                        'DEC':        match.group(3),
-                        'Angle':      match.group(4),
-                        'Star_Count': match.group(5)
-                    })
-                    continue
-
-                # Meridian Flip Begin
-                match = REGEX_PATTERNS['meridian_flip_begin'].search(line)
-                if match:
-                    local_event_data['meridian_flip'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'Begin',
-                        'Details':    match.group(2)
-                    })
-                    continue
-                
-                match = REGEX_PATTERNS['meridian_flip_start'].search(line)
-                if match:
-                    local_event_data['meridian_flip'].append({
-                        'Timestamp': match.group(1),
-                        'Event_Type': 'Start Action',
-                        'Details': f"Flip #{match.group(2)}"
-                    })
-                    continue
-                
-                match = REGEX_PATTERNS['meridian_flip_end'].search(line)
-                if match:
-                    local_event_data['meridian_flip'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'End',
-                        'Details':    match.group(2)
-                    })
-                    continue
-
-                # Auto-Center Begin
-                match = REGEX_PATTERNS['auto_center_begin'].search(line)
-                if match:
-                    local_event_data['auto_center'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'Begin',
-                        'Details':    f"Auto-Center #{match.group(2)}"
-                    })
-                    continue
-
-                match = REGEX_PATTERNS['auto_center_end'].search(line)
-                if match:
-                    local_event_data['auto_center'].append({
-                        'Timestamp':  match.group(1),
-                        'Event_Type': 'End',
-                        'Details':    match.group(2)
-                    })
-                    continue
-                
-                match = REGEX_PATTERNS['mount_slew'].search(line)
-                if match:
-                    # Ensure 'mount_slew' key exists
-                    if 'mount_slew' not in local_event_data: 
-                        local_event_data['mount_slew'] = []
-                    local_event_data['mount_slew'].append({
-                        'Timestamp': match.group(1),
-                        'RA':        match.group(2),
-                        'DEC':       match.group(3)
-                    })
-                    continue
-
-                match = REGEX_PATTERNS['wait_message'].search(line)
-                if match:
-                    # Ensure 'wait' key exists
-                    if 'wait' not in local_event_data: 
-                        local_event_data['wait'] = []
-                    local_event_data['wait'].append({
-                        'Timestamp': match.group(1),
-                        'Message':   match.group(2)
-                    })
-                    continue
-                
-                # Logging Enabled / Disabled
-                for log_event_key, log_event_name in [
-                    ('logging_enabled', 'Enabled'),
-                    ('logging_disabled', 'Disabled')
-                ]:
-                    match = REGEX_PATTERNS[log_event_key].search(line)
-                    if match:
-                        # Ensure 'logging' key exists
-                        if 'logging' not in local_event_data: 
-                            local_event_data['logging'] = []
-                        local_event_data['logging'].append({
-                            'Timestamp':  match.group(1),
-                            'Event_Type': log_event_name
-                        })
-                        break 
-                if match: continue
+                _parse_line(line.rstrip(b'\r\n'), emit)
 
     except FileNotFoundError:
         print(f"[autofocus_analysis] Log file not found: {file_path}")
@@ -352,11 +242,15 @@ def find_log_files(directory, prefix):
     Returns:
         list: A list of file paths matching the prefix.
     """
-    return [
-        os.path.join(directory, file)
-        for file in os.listdir(directory)
-        if file.startswith(prefix) and file.endswith('.txt')  # Assuming log files have .txt extension
-    ]
+    # os.scandir yields DirEntry objects with the full path and cached file type,
+    # so no separate os.path.join / stat per entry is needed.
+    with os.scandir(directory) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith('.txt')  # Assuming log files have .txt extension
+            and entry.is_file()
+        ]
 
 def write_csv_from_df(event_type_key, df, base_filename_map):
     """Writes a DataFrame to a CSV file if it's not empty."""
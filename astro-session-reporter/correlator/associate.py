@@ -1,36 +1,62 @@
 from typing import List
 
-from utils.session_model import ExposureMeta, ImageFrame, GuideFrame, GuideEvent
-from shared.timestamp_utils import within
+import numpy as np
 
+from utils.session_model import ExposureMeta, ImageFrame, GuideFrames, GuideEvent
+from shared.timestamp_utils import to_datetime64, within_vec
 
-def associate(expos: List[ExposureMeta], images: List[ImageFrame], guides: List[GuideFrame], events: List[GuideEvent], tol_filename: float = 60.0):
+
+def associate(expos: List[ExposureMeta], images: List[ImageFrame], guides: GuideFrames, events: List[GuideEvent], tol_filename: float = 60.0):
     """Populate links and confidence on ExposureMeta list."""
 
     # Index images by filename for fast lookup
     image_by_name = {im.fits_name: im for im in images}
 
-    for meta in expos:
+    # Sort once so every per-exposure lookup is a binary search instead of a full scan
+    images_by_start = sorted(images, key=lambda im: im.start_dt_utc)
+    events = sorted(events, key=lambda ev: ev.abs_dt_utc)
+
+    # Time fallback for exposures without a filename match: the earliest image starting
+    # within tol_filename of the autorun line. One searchsorted finds the first start
+    # >= t - tol for all of them and one within_vec checks it is <= t + tol.
+    by_time = [None] * len(expos)
+    unnamed = [i for i, meta in enumerate(expos) if meta.fits_name not in image_by_name]
+    if unnamed and images_by_start:
+        starts = np.array([to_datetime64(im.start_dt_utc) for im in images_by_start], dtype="datetime64[us]")
+        t = np.array([to_datetime64(expos[i].autorun_line_dt_utc) for i in unnamed], dtype="datetime64[us]")
+        tol = np.timedelta64(round(tol_filename * 1_000_000), "us")
+        first = np.minimum(np.searchsorted(starts, t - tol, side="left"), len(starts) - 1)
+        for i, j, hit in zip(unnamed, first, within_vec(starts[first], t, tol_filename)):
+            if hit:
+                by_time[i] = images_by_start[j]
+
+    for meta, im_by_time in zip(expos, by_time):
         # 1) attach image
         img = image_by_name.get(meta.fits_name)
         conf = 0.0
         if img:
             meta.image_frame = img
             conf = 1.0
-        else:
+        elif im_by_time is not None:
             # fallback by time overlap
-            for im in images:
-                if within(im.start_dt_utc, meta.autorun_line_dt_utc, tol_filename):
-                    meta.image_frame = im
-                    conf = 0.5
-                    break
+            meta.image_frame = im_by_time
+            conf = 0.5
 
         meta.confidence = conf
 
-        # 2) guide frames subset
-        if meta.image_frame:
-            im = meta.image_frame
-            meta.guide_frames = [g for g in guides if im.start_dt_utc <= g.abs_dt_utc <= im.end_dt_utc]
-            meta.guide_events = [ev for ev in events if im.start_dt_utc <= ev.abs_dt_utc <= im.end_dt_utc]
-
-    return expos 
\ No newline at end of file
+    # 2) guide frames / events inside each attached image's [start, end]. Frames and
+    # events are time-sorted, so all window bounds come from one searchsorted per side.
+    linked = [meta for meta in expos if meta.image_frame]
+    if linked:
+        starts = np.array([to_datetime64(meta.image_frame.start_dt_utc) for meta in linked], dtype="datetime64[us]")
+        ends = np.array([to_datetime64(meta.image_frame.end_dt_utc) for meta in linked], dtype="datetime64[us]")
+        event_times = np.array([to_datetime64(ev.abs_dt_utc) for ev in events], dtype="datetime64[us]")
+        g_lo = np.searchsorted(guides.abs_dt_utc, starts, side="left")
+        g_hi = np.searchsorted(guides.abs_dt_utc, ends, side="right")
+        e_lo = np.searchsorted(event_times, starts, side="left")
+        e_hi = np.searchsorted(event_times, ends, side="right")
+        for meta, gl, gh, el, eh in zip(linked, g_lo, g_hi, e_lo, e_hi):
+            meta.guide_frames = guides.slice(gl, gh)
+            meta.guide_events = events[el:eh]
+
+    return expos
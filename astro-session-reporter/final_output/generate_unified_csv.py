@@ -1,10 +1,9 @@
-import csv
 import os
 import sys
+from itertools import islice
 import pandas as pd # Added for DataFrame
 from pathlib import Path
 from datetime import datetime
-from typing import List
 import argparse
 
 # Ensure package relative imports work when script run directly
@@ -22,7 +21,9 @@ from correlator.associate import associate
 from parsers.autorun_parser import parse_autorun_log
 from parsers.fits_parser import parse_fits_headers
 from parsers.phd2_parser import parse_phd2_log
+from shared._rms_numba import rms3
 from utils.paths import RAW_DIR as RAW_DIR_ENV, out_path
+from utils.session_model import GuideFrames
 
 
 COLS = [
@@ -31,40 +32,57 @@ COLS = [
 ]
 
 
+DATETIME_COLS = ["start_dt_utc", "end_dt_utc"]
+CSV_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
 PIXEL_SCALE_ARCSEC = 6.45
 
 
-def rms(vals):
-    import math
-    if not vals:
-        return None
-    return math.sqrt(sum(v*v for v in vals) / len(vals))
+def compute_rms(gframes: GuideFrames):
+    if len(gframes) == 0:
+        return None, None, None
+    return rms3(gframes.ra_pix, gframes.dec_pix, PIXEL_SCALE_ARCSEC)
 
 
-def compute_rms(gframes: List):
-    import math
-    ra_as = [g.ra_pix * PIXEL_SCALE_ARCSEC for g in gframes]
-    dec_as = [g.dec_pix * PIXEL_SCALE_ARCSEC for g in gframes]
-    tot_as = [math.sqrt(r*r + d*d) for r,d in zip(ra_as, dec_as)]
-    return rms(ra_as), rms(dec_as), rms(tot_as)
+def scan_raw_dir(raw: Path):
+    """Classify *raw* in a single directory pass.
 
+    Returns (autorun_log_path, phd2_log_path, fits_files); the logs are None when missing.
+    """
+    autorun_log_path = None
+    phd2_log_path = None
+    fits_files = []
+    with os.scandir(raw) as it:
+        for entry in it:
+            name = entry.name
+            if autorun_log_path is None and name.startswith("Autorun_Log") and name.endswith(".txt"):
+                autorun_log_path = Path(entry.path)
+            elif phd2_log_path is None and name.startswith("PHD2_GuideLog") and name.endswith(".txt"):
+                phd2_log_path = Path(entry.path)
+            elif name.startswith("Light_") and ".fit" in name[6:]:  # .fit and .fits
+                fits_files.append(Path(entry.path))
+    return autorun_log_path, phd2_log_path, fits_files
 
-def generate_unified_dataframe(raw_dir_override=None):
-    """Parses all required logs and FITS files, associates them, and returns a unified DataFrame."""
+
+def load_associated_exposures(raw_dir_override=None, fits_index=None):
+    """Parses all required logs and FITS files and associates them.
+
+    FITS files present in *fits_index* (shared.fits_index) are not re-read.
+
+    Returns the ExposureMeta list, or None when there is nothing to report.
+    """
     raw_dir_final = raw_dir_override if raw_dir_override else RAW_DIR_ENV
     if not raw_dir_final:
         print("[generate_unified_csv] ERROR: RAW_DIR not set.")
-        return pd.DataFrame() # Return empty DataFrame on error
+        return None
     
     raw = Path(raw_dir_final)
     if not raw.exists():
         print(f"[generate_unified_csv] ERROR: Raw directory does not exist: {raw}")
-        return pd.DataFrame()
+        return None
 
     # Locate log files - allow for possibility of no logs for robustness
-    autorun_log_path = next(raw.glob("Autorun_Log*.txt"), None)
-    phd2_log_path = next(raw.glob("PHD2_GuideLog*.txt"), None)
-    fits_files = list(raw.glob("Light_*.fit*")) # Handles .fit and .fits
+    autorun_log_path, phd2_log_path, fits_files = scan_raw_dir(raw)
 
     if not autorun_log_path:
         print(f"[generate_unified_csv] WARNING: Autorun_Log not found in {raw}. Unified data might be incomplete.")
@@ -74,7 +92,7 @@ def generate_unified_dataframe(raw_dir_override=None):
 
     if not phd2_log_path:
         print(f"[generate_unified_csv] WARNING: PHD2_GuideLog not found in {raw}. Guiding data will be missing.")
-        guides, events = [], []
+        guides, events = GuideFrames.empty(), []
     else:
         guides, events, _ = parse_phd2_log(phd2_log_path)
 
@@ -82,16 +100,20 @@ def generate_unified_dataframe(raw_dir_override=None):
         print(f"[generate_unified_csv] WARNING: No FITS files (Light_*.fit*) found in {raw}. Image data will be missing.")
         images = []
     else:
-        images = parse_fits_headers(fits_files)
+        images = parse_fits_headers(fits_files, fits_index=fits_index)
 
     # Associate data (modifies expos in-place)
     if expos and (images or guides or events): # Only associate if there's something to associate
         associate(expos, images, guides, events)
     elif not expos:
         print("[generate_unified_csv] No exposure metadata to drive association.")
-        return pd.DataFrame()
+        return None
 
-    data_for_df = []
+    return expos
+
+
+def iter_unified_rows(expos):
+    """Yield one list per exposure with an associated image, in COLS order."""
     for meta in expos:
         if not meta.image_frame: # Skip if no associated image frame
             if os.getenv("DEBUG") == "1":
@@ -104,53 +126,93 @@ def generate_unified_dataframe(raw_dir_override=None):
 
         star_lost_count = len([ev for ev in meta.guide_events if ev.type=="star_lost"]) if meta.guide_events else 0
         
-        # Format datetimes as ISO strings for DataFrame compatibility
-        start_dt_iso = meta.image_frame.start_dt_utc.isoformat() if meta.image_frame.start_dt_utc else None
-        end_dt_iso = meta.image_frame.end_dt_utc.isoformat() if meta.image_frame.end_dt_utc else None
-
-        row_dict = {
-            COLS[0]: meta.image_frame.fits_name,
-            COLS[1]: start_dt_iso,
-            COLS[2]: end_dt_iso,
-            COLS[3]: meta.image_frame.ra_deg,
-            COLS[4]: meta.image_frame.dec_deg,
-            COLS[5]: meta.image_frame.alt_deg,
-            COLS[6]: meta.image_frame.az_deg,
-            COLS[7]: meta.image_frame.exposure_s,
-            COLS[8]: ra_rms,
-            COLS[9]: dec_rms,
-            COLS[10]: tot_rms,
-            COLS[11]: star_lost_count,
-            COLS[12]: meta.image_frame.mean_pix,
-            COLS[13]: meta.image_frame.std_pix,
-            COLS[14]: meta.confidence,
-        }
-        data_for_df.append(row_dict)
-    
-    if not data_for_df:
+        # Datetimes stay native; _rows_to_frame converts them column-wise
+        img = meta.image_frame
+        yield [
+            img.fits_name,
+            img.start_dt_utc,
+            img.end_dt_utc,
+            img.ra_deg,
+            img.dec_deg,
+            img.alt_deg,
+            img.az_deg,
+            img.exposure_s,
+            ra_rms,
+            dec_rms,
+            tot_rms,
+            star_lost_count,
+            img.mean_pix,
+            img.std_pix,
+            meta.confidence,
+        ]
+
+
+def _rows_to_frame(rows) -> pd.DataFrame:
+    """Build a DataFrame from unified rows with naive-UTC datetime64 time columns."""
+    df = pd.DataFrame(rows, columns=COLS)
+    for col in DATETIME_COLS:
+        # Naive UTC keeps the columns writable to Excel, which rejects tz-aware values
+        df[col] = pd.to_datetime(df[col], utc=True).dt.tz_localize(None)
+    return df
+
+
+def generate_unified_dataframe(raw_dir_override=None, fits_index=None):
+    """Parses all required logs and FITS files, associates them, and returns a unified DataFrame."""
+    expos = load_associated_exposures(raw_dir_override, fits_index)
+    if expos is None:
+        return pd.DataFrame()
+
+    rows = list(iter_unified_rows(expos))
+    if not rows:
         print("[generate_unified_csv] No data rows were generated for the unified report.")
         return pd.DataFrame()
         
-    return pd.DataFrame(data_for_df, columns=COLS)
+    return _rows_to_frame(rows)
+
+
+def write_unified_csv(expos, out_csv_path) -> int:
+    """Stream the unified rows for *expos* to *out_csv_path*; returns the row count.
+
+    Rows are written as they are produced, so memory stays bounded for huge sessions.
+    Nothing is written when there are no rows.
+    """
+    rows = iter_unified_rows(expos)
+    n_rows = 0
+    with open(out_csv_path, "w", newline="", encoding="utf-8") as fh:
+        while True:
+            batch = list(islice(rows, 10_000))
+            if not batch:
+                break
+            # pandas formats each batch's datetime columns in C via date_format
+            _rows_to_frame(batch).to_csv(
+                fh, header=(n_rows == 0), index=False,
+                date_format=CSV_DATE_FORMAT, lineterminator="\n",
+            )
+            n_rows += len(batch)
+    if n_rows == 0:
+        os.remove(out_csv_path)
+    return n_rows
 
 
 def main():
-    # raw_dir_final is determined by argparse or ENV inside generate_unified_dataframe if called by run_all
+    # raw_dir_final is determined by argparse or ENV inside load_associated_exposures if called by run_all
     # If run standalone, args.raw_dir can be used, or RAW_DIR_ENV will be used by default.
-    unified_df = generate_unified_dataframe(raw_dir_override=args.raw_dir)
-
-    if __name__ == "__main__": # Only write CSV if run as a script
-        if not unified_df.empty:
-            out_csv_path = out_path(f"unified_{datetime.now():%Y%m%d-%H%M%S}.csv")
-            try:
-                unified_df.to_csv(out_csv_path, index=False)
+    expos = load_associated_exposures(raw_dir_override=args.raw_dir)
+    n_rows = 0
+
+    if expos is not None:
+        out_csv_path = out_path(f"unified_{datetime.now():%Y%m%d-%H%M%S}.csv")
+        try:
+            n_rows = write_unified_csv(expos, out_csv_path)
+            if n_rows:
                 print(f"[generate_unified_csv] Unified CSV written to: {out_csv_path}")
-            except Exception as e:
-                print(f"[generate_unified_csv] Error writing unified CSV to {out_csv_path}: {e}")
-        else:
-            print("[generate_unified_csv] No data to write to unified CSV.")
-    
-    return unified_df # Return for potential import use
+        except Exception as e:
+            print(f"[generate_unified_csv] Error writing unified CSV to {out_csv_path}: {e}")
+
+    if not n_rows:
+        print("[generate_unified_csv] No data to write to unified CSV.")
+
+    return n_rows
 
 
 if __name__ == "__main__":
@@ -1,20 +1,46 @@
 import re
 import os
 from pathlib import Path
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from datetime import timezone
 
-from shared.timestamp_utils import parse_any
+from shared.timestamp_utils import parse_log_time
 from utils.session_model import ExposureMeta
 
 
+# N.I.N.A always writes "Exposure ... image" with this casing, so no IGNORECASE here
 EXPOSURE_LINE = re.compile(
-    r'^(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})\s+Exposure\s+([\d.]+)s\s+image\s+(\d+)#',
-    re.IGNORECASE,
+    rb'^(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})\s+Exposure\s+([\d.]+)s\s+image\s+(\d+)#',
 )
-FILENAME_LINE = re.compile(r'^(Light_\S+\.fit[s]?)$', re.IGNORECASE)
+# Extension case varies (".fits" / ".FIT"); only tried on the line after an exposure
+FILENAME_LINE = re.compile(rb'^(Light_\S+\.fit[s]?)$', re.IGNORECASE)
 
-time_fmt = "%Y/%m/%d %H:%M:%S"
+
+def match_exposure_line(line: bytes) -> Optional[Tuple[bytes, float, int]]:
+    """Return (start_str, exposure_s, image_num) for an exposure line, else None.
+
+    Exposure lines are rare and fixed-layout ("2025/01/25 20:29:07 Exposure 300.0s image 1#"),
+    so other lines are rejected with a substring test and matches are split rather than
+    run through EXPOSURE_LINE, which is only the fallback for odd spacing or suffixes.
+    """
+    if b"Exposure" not in line:
+        return None
+    parts = line.split()
+    if (len(parts) == 6 and parts[2] == b"Exposure" and parts[4] == b"image"
+            and parts[3][-1:] == b"s" and parts[3][:-1].replace(b".", b"").isdigit()
+            and parts[5][-1:] == b"#" and parts[5][:-1].isdigit()
+            and line[4:5] == b"/" and line[7:8] == b"/"):
+        return parts[0] + b" " + parts[1], float(parts[3][:-1]), int(parts[5][:-1])
+    m_exp = EXPOSURE_LINE.match(line)
+    if m_exp is None:
+        return None
+    start_str, exp_s_str, img_num_str = m_exp.groups()
+    return start_str, float(exp_s_str), int(img_num_str)
+
+
+def is_filename_candidate(line: bytes) -> bool:
+    """Cheap pre-check before FILENAME_LINE: only "Light_*.fit(s)" lines can match."""
+    return line[:6].lower() == b"light_" and line[-5:].lower().endswith((b".fit", b".fits"))
 
 
 def parse_autorun_log(log_path: Path) -> List[ExposureMeta]:
@@ -22,26 +48,24 @@ def parse_autorun_log(log_path: Path) -> List[ExposureMeta]:
     metas: List[ExposureMeta] = []
     last_meta = None
 
-    with open(log_path, "r", encoding="utf-8") as fh:
-        for raw in fh:
-            line = raw.strip()
-            m_exp = EXPOSURE_LINE.match(line)
-            if m_exp:
-                start_local_str, exp_s_str, img_num_str = m_exp.groups()
-                start_dt = datetime.strptime(start_local_str, time_fmt)
-                exposure_s = float(exp_s_str)
-                end_dt = start_dt + timedelta(seconds=exposure_s)
-                last_meta = ExposureMeta(
-                    image_num=int(img_num_str),
-                    fits_name="",  # placeholder until next line supplies it
-                    exposure_s=exposure_s,
-                    autorun_line_dt_utc=parse_any(start_dt.isoformat()),
-                )
-                metas.append(last_meta)
-                continue
-
-            if last_meta and not last_meta.fits_name:
-                m_fn = FILENAME_LINE.match(line)
-                if m_fn:
-                    last_meta.fits_name = m_fn.group(1)
+    # One read + one C-level split; only the captured fields are decoded
+    for raw in Path(log_path).read_bytes().splitlines():
+        line = raw.strip()
+        exp = match_exposure_line(line)
+        if exp:
+            start_local_str, exposure_s, img_num = exp
+            start_dt = parse_log_time(start_local_str.decode("ascii"))
+            last_meta = ExposureMeta(
+                image_num=img_num,
+                fits_name="",  # placeholder until next line supplies it
+                exposure_s=exposure_s,
+                autorun_line_dt_utc=start_dt.replace(tzinfo=timezone.utc),
+            )
+            metas.append(last_meta)
+            continue
+
+        if last_meta and not last_meta.fits_name and is_filename_candidate(line):
+            m_fn = FILENAME_LINE.match(line)
+            if m_fn:
+                last_meta.fits_name = m_fn.group(1).decode("utf-8", errors="replace")
     return metas 
\ No newline at end of file
@@ -1,10 +1,24 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+import pandas as pd
 from astropy.io import fits
+from shared.file_cache import file_key, load_cache, prune_stale, save_cache
 from shared.timestamp_utils import parse_any
+from utils.paths import out_path
 from utils.session_model import ImageFrame
 from datetime import timedelta
 
+try:
+    # Cython fast path that tokenises only the primary header cards
+    from astropy.io.fits.header import _BasicHeader
+except ImportError:  # private API, may move between astropy releases
+    _BasicHeader = None
+
+
+CACHE_NAME = ".fits_header_cache.pkl"
+_CACHE_VERSION = 2
 
 HEADER_KEYS = [
     "DATE-OBS",
@@ -19,41 +33,122 @@ HEADER_KEYS = [
 ]
 
 
-def parse_fits_headers(fits_files: List[Path]) -> List[ImageFrame]:
-    frames: List[ImageFrame] = []
-    for fp in fits_files:
+def read_primary_header(fp: Path):
+    """Read only the primary header of *fp*, falling back to fits.getheader."""
+    if _BasicHeader is not None:
+        try:
+            with open(fp, "rb") as fh:
+                return _BasicHeader.fromfile(fh)[1]
+        except Exception:
+            pass  # non-standard cards etc.; let the full parser deal with it
+    return fits.getheader(fp)
+
+
+def _parse_one(fp: Path) -> Optional[ImageFrame]:
+    try:
+        hdr = read_primary_header(fp)
+    except Exception as exc:
+        print(f"[fits_parser] Cannot read header for {fp}: {exc}")
+        return None
+    return frame_from_header(fp, hdr)
+
+
+def frame_from_header(fp: Path, hdr) -> Optional[ImageFrame]:
+    """Build the ImageFrame for *fp* from its header (any mapping with ``.get``)."""
+    try:
+        start_dt = parse_any(hdr.get("DATE-OBS"))
+    except Exception as exc:
+        print(f"[fits_parser] Invalid DATE-OBS in {fp}: {exc}")
+        return None
+
+    exposure_s = float(hdr.get("EXPTIME", hdr.get("EXPOSURE", 0.0)))
+    end_dt = start_dt + timedelta(seconds=exposure_s)
+
+    ra_deg = float(hdr.get("RA", 0.0))
+    dec_deg = float(hdr.get("DEC", 0.0))
+
+    alt_deg = float(hdr.get("ALT", hdr.get("ALT_DEG", 0.0)))
+    az_deg = float(hdr.get("AZ", hdr.get("AZ_DEG", 0.0)))
+
+    return ImageFrame(
+        fits_name=Path(fp).name,
+        start_dt_utc=start_dt,
+        end_dt_utc=end_dt,
+        ra_deg=ra_deg,
+        dec_deg=dec_deg,
+        alt_deg=alt_deg,
+        az_deg=az_deg,
+        exposure_s=exposure_s,
+        mean_pix=float(hdr.get("MEAN_PIX", 0.0)),
+        std_pix=float(hdr.get("STD_PIX", 0.0)),
+    )
+
+
+def index_headers(fits_index: pd.DataFrame) -> dict:
+    """Map absolute path -> {keyword: value} for each shared.fits_index row, leaving out missing keywords."""
+    headers = {}
+    for row in fits_index.to_dict("records"):
+        path = row.pop("path")
+        row.pop("name")
+        headers[path] = {key: value for key, value in row.items() if not pd.isna(value)}
+    return headers
+
+
+def _parse_many(fits_files: List[Path]) -> List[Optional[ImageFrame]]:
+    # Header reads are I/O bound and release the GIL, so overlap them across files
+    workers = min(len(fits_files), os.cpu_count() or 1)
+    if workers <= 1:
+        return [_parse_one(fp) for fp in fits_files]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_one, fits_files))
+
+
+def parse_fits_headers(fits_files: List[Path], use_cache: bool = True, fits_index=None) -> List[ImageFrame]:
+    """Parse the primary header of each file into an ImageFrame.
+
+    With *use_cache*, frames are memoised on disk (REPORTS_DIR) keyed by
+    (path, mtime, size), so reruns only open new or modified files.
+    Files present in *fits_index* (see shared.fits_index) are built from their
+    already-read header values without opening them.
+    """
+    if fits_index is not None:
+        indexed = index_headers(fits_index)
+        frames, rest = [], []
+        for fp in fits_files:
+            hdr = indexed.get(os.path.abspath(fp))
+            if hdr is None:
+                rest.append(fp)
+            else:
+                frames.append(frame_from_header(fp, hdr))
+        frames = [frame for frame in frames if frame is not None]
+        return frames + (parse_fits_headers(rest, use_cache) if rest else [])
+
+    cache_path = None
+    if use_cache:
         try:
-            hdr = fits.getheader(fp)
-        except Exception as exc:
-            print(f"[fits_parser] Cannot read header for {fp}: {exc}")
-            continue
+            cache_path = out_path(CACHE_NAME)
+        except Exception:
+            cache_path = None  # no REPORTS_DIR; parse everything
+
+    if cache_path is None:
+        return [frame for frame in _parse_many(fits_files) if frame is not None]
 
+    cache = load_cache(cache_path, _CACHE_VERSION)
+    keys = []
+    for fp in fits_files:
         try:
-            start_dt = parse_any(hdr.get("DATE-OBS"))
-        except Exception as exc:
-            print(f"[fits_parser] Invalid DATE-OBS in {fp}: {exc}")
-            continue
-
-        exposure_s = float(hdr.get("EXPTIME", hdr.get("EXPOSURE", 0.0)))
-        end_dt = start_dt + timedelta(seconds=exposure_s)
-
-        ra_deg = float(hdr.get("RA", 0.0))
-        dec_deg = float(hdr.get("DEC", 0.0))
-
-        alt_deg = float(hdr.get("ALT", hdr.get("ALT_DEG", 0.0)))
-        az_deg = float(hdr.get("AZ", hdr.get("AZ_DEG", 0.0)))
-
-        frame = ImageFrame(
-            fits_name=fp.name,
-            start_dt_utc=start_dt,
-            end_dt_utc=end_dt,
-            ra_deg=ra_deg,
-            dec_deg=dec_deg,
-            alt_deg=alt_deg,
-            az_deg=az_deg,
-            exposure_s=exposure_s,
-            mean_pix=float(hdr.get("MEAN_PIX", 0.0)),
-            std_pix=float(hdr.get("STD_PIX", 0.0)),
-        )
-        frames.append(frame)
-    return frames 
\ No newline at end of file
+            keys.append(file_key(fp))
+        except OSError:
+            keys.append(None)  # let _parse_one report the unreadable file
+
+    missing = [(fp, key) for fp, key in zip(fits_files, keys) if key not in cache]
+    if missing:
+        frames = _parse_many([fp for fp, _ in missing])
+        for (fp, key), frame in zip(missing, frames):
+            if frame is not None and key is not None:
+                cache[key] = frame
+        # Deleted or rewritten files would otherwise keep their old entries forever
+        prune_stale(cache, keep=keys)
+        save_cache(cache_path, cache, _CACHE_VERSION, tag="fits_parser")
+
+    return [cache[key] for key in keys if key in cache]
@@ -1,51 +1,89 @@
 import re
 from pathlib import Path
 from typing import List, Tuple, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from shared.timestamp_utils import parse_any
-from utils.session_model import GuideFrame, GuideEvent
+import numpy as np
 
+from shared.timestamp_utils import parse_any_specialized, parse_log_time, sniff_timestamp_format
+from utils.session_model import GuideFrames, GuideEvent
 
-time_fmt = "%Y-%m-%d %H:%M:%S"
 
-DATA_LINE = re.compile(
-    r'^(\d+),(\d+\.\d+),"Mount",([-+\d.]+),([-+\d.]+),([-+\d.]+),([-+\d.]+),',
-)
+# Data rows look like: frame,rel_time,"Mount",dx,dy,RARawDistance,DECRawDistance,...
+MOUNT_FIELD = b'"Mount"'
 
-STAR_LOST_PAT = re.compile(r'.*Guide star lost')
-GUIDE_BEGINS_PAT = re.compile(r'Guiding Begins at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+GUIDE_BEGINS_PAT = re.compile(rb'Guiding Begins at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
 
 
-def parse_phd2_log(log_path: Path) -> Tuple[List[GuideFrame], List[GuideEvent], Optional[datetime]]:
-    guides: List[GuideFrame] = []
+def _fill_session(cols, n: int, guiding_start: datetime, rel_t: List[bytes], ra: List[bytes], dec: List[bytes]) -> int:
+    """Convert one guiding session's buffered byte-string columns into ``cols[n:]``.
+
+    Returns the new fill count.
+    """
+    abs_dt, ra_out, dec_out = cols
+    k = len(rel_t)
+    rel_us = np.rint(np.array(rel_t, dtype=np.float64) * 1e6).astype(np.int64)
+    abs_dt[n:n + k] = np.datetime64(guiding_start, "us") + rel_us.astype("timedelta64[us]")
+    ra_out[n:n + k] = ra
+    dec_out[n:n + k] = dec
+    return n + k
+
+
+def parse_phd2_log(log_path: Path) -> Tuple[GuideFrames, List[GuideEvent], Optional[datetime]]:
+    data = Path(log_path).read_bytes()
+
+    # Every data row carries the "Mount" marker, so this bounds the frame count and the
+    # output columns can be filled in place rather than concatenated per session
+    cap = data.count(b',' + MOUNT_FIELD + b',')
+    cols = (np.empty(cap, dtype="datetime64[us]"), np.empty(cap, np.float32), np.empty(cap, np.float32))
+    n = 0
+
+    # Lines stay undecoded bytes; data rows are only split and buffered here, and each
+    # guiding session's columns are then converted in a single NumPy call
+    rel_col: List[bytes] = []
+    ra_col: List[bytes] = []
+    dec_col: List[bytes] = []
     events: List[GuideEvent] = []
     guiding_start: datetime | None = None
+    lost_ts_kind: int | None = None  # layout of the star-lost stamps, sniffed from the first
+
+    for raw in data.splitlines():
+        line = raw.strip()
+        # Data rows make up nearly the whole log, so dispatch on the first
+        # character and only fall back to the regexes for the rare text lines
+        if line[:1].isdigit():
+            fields = line.split(b",", 7)
+            if len(fields) == 8 and fields[2] == MOUNT_FIELD:
+                # Rows without a full set of offsets (e.g. star lost) are skipped
+                if guiding_start and all(fields[3:7]):
+                    rel_col.append(fields[1])
+                    ra_col.append(fields[3])
+                    dec_col.append(fields[4])
+                continue
 
-    with open(log_path, "r", encoding="utf-8") as fh:
-        for raw in fh:
-            line = raw.strip()
+        if b"Guiding Begins" in line:
             mbeg = GUIDE_BEGINS_PAT.search(line)
             if mbeg:
-                guiding_start = datetime.strptime(mbeg.group(1), time_fmt)
+                if rel_col:
+                    n = _fill_session(cols, n, guiding_start, rel_col, ra_col, dec_col)
+                    rel_col, ra_col, dec_col = [], [], []
+                guiding_start = parse_log_time(mbeg.group(1).decode("ascii"))
                 continue
 
-            if STAR_LOST_PAT.search(line):
-                if guiding_start is None:
-                    continue
-                parts = line.split(" ")
-                dt_str = " ".join(parts[:2])
-                ev_dt = parse_any(dt_str)
-                events.append(GuideEvent(abs_dt_utc=ev_dt, type="star_lost", details=""))
+        if b"Guide star lost" in line:
+            if guiding_start is None:
                 continue
+            parts = line.split(b" ")
+            dt_str = b" ".join(parts[:2]).decode("utf-8", errors="replace")
+            if lost_ts_kind is None:
+                lost_ts_kind = sniff_timestamp_format(dt_str)
+            ev_dt = parse_any_specialized(lost_ts_kind, dt_str)
+            events.append(GuideEvent(abs_dt_utc=ev_dt, type="star_lost", details=""))
 
-            mdata = DATA_LINE.match(line)
-            if mdata and guiding_start:
-                frame_idx = int(mdata.group(1))
-                rel_t = float(mdata.group(2))
-                ra_pix = float(mdata.group(3))
-                dec_pix = float(mdata.group(4))
-                abs_dt = guiding_start + timedelta(seconds=rel_t)
-                guides.append(GuideFrame(abs_dt_utc=abs_dt, ra_pix=ra_pix, dec_pix=dec_pix))
+    if rel_col:
+        n = _fill_session(cols, n, guiding_start, rel_col, ra_col, dec_col)
 
-    return guides, events, guiding_start 
\ No newline at end of file
+    abs_dt, ra_pix, dec_pix = (col[:n] for col in cols)
+    order = np.argsort(abs_dt, kind="stable")
+    guides = GuideFrames(abs_dt_utc=abs_dt[order], ra_pix=ra_pix[order], dec_pix=dec_pix[order])
+    return guides, events, guiding_start
@@ -16,16 +16,29 @@ Final version that:
 Check the user-defined constants and regex patterns to match your actual log styles.
 """
 
+import io
 import re
 import os
-import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import csv
+import numpy as np
 import pandas as pd # Added for DataFrame
 from datetime import datetime, timedelta
-from astropy.io import fits  # Added to read FITS headers
+try:
+    import fitsio  # optional: C-level reader that only touches the requested HDU
+except ImportError:
+    fitsio = None
 
 # Path helpers for directories
 from utils.paths import RAW_DIR, out_path
+from utils.session_model import GuideFrames
+from shared.timestamp_utils import to_datetime64
+# Fused RA/DEC/total RMS kernel (numba-compiled when available, NumPy otherwise)
+from shared._rms_numba import rms3
+from parsers.fits_parser import read_primary_header, index_headers
+from shared.file_cache import file_key, load_cache, save_cache
+from parsers.autorun_parser import match_exposure_line, is_filename_candidate
 
 # Filenames or partial prefixes for the logs:
 AUTORUN_LOG_PREFIX = "Autorun_Log"  # e.g. "Autorun_Log_2025-01-25_202645.txt"
@@ -52,12 +65,21 @@ def dbg(msg: str):
 # -------------------------
 # 1) Locate the log files
 # -------------------------
-def find_all_files_with_prefix(dir_path, prefix, extension):
+def list_file_names(dir_path):
+    """Names of the regular files in 'dir_path'.
+    os.scandir reports the entry type from the directory read itself, so no per-entry stat is needed."""
+    with os.scandir(dir_path) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
+
+def find_all_files_with_prefix(dir_path, prefix, extension, names=None):
     """
     Search 'dir_path' for all files that start with 'prefix' and end with 'extension'.
     Returns a sorted list of matching file paths.
+    Pass 'names' (an existing listing of dir_path) to avoid reading the directory again.
     """
-    matches = [fname for fname in os.listdir(dir_path) if fname.startswith(prefix) and fname.endswith(extension)]
+    if names is None:
+        names = list_file_names(dir_path)
+    matches = [fname for fname in names if fname.startswith(prefix) and fname.endswith(extension)]
     if not matches:
         return []
     matches.sort()
@@ -66,7 +88,26 @@ def find_all_files_with_prefix(dir_path, prefix, extension):
 # -------------------------
 # 2) Parse the Autorun Log
 # -------------------------
-def parse_autorun_log(log_path):
+# Exposure lines, e.g. "2025/01/25 20:29:07 Exposure 300.0s image 1#", are matched by
+# match_exposure_line (substring pre-check + split, with the regex only as a fallback)
+# Pattern for .fits lines (extension case varies between capture programs)
+# e.g. "Light_LDN 1625_300.0s_Bin1_gain252_20250125-203409_-20.0C_0001.fits"
+FITS_NAME_PAT = re.compile(rb'^(Light_\S+\.fit[s]?)$', re.IGNORECASE)
+
+def _read_date_obs(fits_file_path):
+    """DATE-OBS from the primary header only (fitsio if installed, else astropy's fast header parser)."""
+    if fitsio is not None:
+        return fitsio.read_header(fits_file_path, 0).get('DATE-OBS')
+    return read_primary_header(fits_file_path).get('DATE-OBS')
+
+def _try_read_date_obs(fits_file_path):
+    """(date_obs, None) on success, (None, exception) on failure; safe to run in a worker thread."""
+    try:
+        return _read_date_obs(fits_file_path), None
+    except Exception as e:
+        return None, e
+
+def parse_autorun_log(log_path, names=None, fits_index=None):
     """
     Reads lines from an autorun log to extract:
       - image_num
@@ -77,6 +118,10 @@ def parse_autorun_log(log_path):
       2025/01/25 20:29:07 Exposure 300.0s image 1#
       Light_LDN 1625_300.0s_Bin1_gain252_20250125-203409_-20.0C_0001.fits
     
+    Pass 'names' (an existing file listing of the log's directory) to reuse it for the
+    filename fallback instead of reading the directory again, and 'fits_index'
+    (shared.fits_index) to take DATE-OBS from already-read headers.
+
     Returns a list of dicts, each dict like:
       {
         "image_num": 1,
@@ -91,84 +136,129 @@ def parse_autorun_log(log_path):
         return []
 
     images = []
-    time_format = "%Y/%m/%d %H:%M:%S"
-
-    # Pattern for exposure lines
-    # e.g. "2025/01/25 20:29:07 Exposure 300.0s image 1#"
-    exposure_pat = re.compile(
-        r'^(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})\s+Exposure\s+([\d.]+)s\s+image\s+(\d+)#'
-    )
-    # Pattern for .fits lines
-    # e.g. "Light_LDN 1625_300.0s_Bin1_gain252_20250125-203409_-20.0C_0001.fits"
-    fits_pat = re.compile(r'^(Light_\S+\.fit[s]?)$', re.IGNORECASE)
-
     last_image_dict = None
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-
-            # 1) Check if it's an "Exposure" line
-            m_exp = exposure_pat.match(line)
-            if m_exp:
-                start_str   = m_exp.group(1)    # "2025/01/25 20:29:07"
-                exposure_s  = float(m_exp.group(2))  # 300.0
-                img_num     = int(m_exp.group(3))    # 1
-
-                start_dt = datetime.strptime(start_str, time_format)
-                last_image_dict = {
-                    "image_num": img_num,
-                    "start_dt":  start_dt,
-                    "exposure_s": exposure_s,
-                    "end_dt":    start_dt + timedelta(seconds=exposure_s),
-                    "filename":  None
-                }
-                images.append(last_image_dict)
-                continue
-
-            # 2) If we have an active "last_image_dict", see if this line is a .fits filename.
-            # If so, try to override the timestamp using the FITS header DATE-OBS.
-            if last_image_dict is not None and last_image_dict["filename"] is None:
-                m_fits = fits_pat.match(line)
-                if m_fits:
-                    filename_str = m_fits.group(1)  # the entire matched line
-                    last_image_dict["filename"] = filename_str
-                    try:
-                        # Assume the FITS file is in the same directory as the log file.
-                        fits_file_path = os.path.join(os.path.dirname(log_path), filename_str)
-                        header = fits.getheader(fits_file_path)
-                        date_obs = header.get('DATE-OBS')
-                        if date_obs:
-                            # DATE-OBS is expected in ISO format, e.g., '2025-03-01T03:58:35.470867'
-                            obs_dt = datetime.fromisoformat(date_obs)
-                            last_image_dict["start_dt"] = obs_dt
-                            last_image_dict["end_dt"] = obs_dt + timedelta(seconds=last_image_dict["exposure_s"])
-                    except Exception as e:
-                        print(f"Error reading FITS header from {fits_file_path}: {e}")
+    # Matched as bytes (like the PHD2 log); only the captured fields are decoded
+    with open(log_path, 'rb') as f:
+        lines = f.read().splitlines()
+
+    for line in lines:
+        line = line.strip()
+
+        # 1) Check if it's an "Exposure" line
+        exp = match_exposure_line(line)
+        if exp:
+            start_str   = exp[0].decode('ascii')  # "2025/01/25 20:29:07"
+            exposure_s  = exp[1]                  # 300.0
+            img_num     = exp[2]                  # 1
+
+            # fromisoformat is far cheaper than strptime for this fixed layout
+            start_dt = datetime.fromisoformat(start_str.replace('/', '-'))
+            last_image_dict = {
+                "image_num": img_num,
+                "start_dt":  start_dt,
+                "exposure_s": exposure_s,
+                "end_dt":    start_dt + timedelta(seconds=exposure_s),
+                "filename":  None
+            }
+            images.append(last_image_dict)
+            continue
+
+        # 2) If we have an active "last_image_dict", see if this line is a .fits filename.
+        # If so, its FITS header DATE-OBS will override the timestamp (read below).
+        if last_image_dict is not None and last_image_dict["filename"] is None and is_filename_candidate(line):
+            m_fits = FITS_NAME_PAT.match(line)
+            if m_fits:
+                last_image_dict["filename"] = m_fits.group(1).decode('utf-8', errors='replace')  # the entire matched line
+
+    # Override start/end with DATE-OBS. Header reads are I/O bound, so overlap them across files.
+    # Assume the FITS files are in the same directory as the log file.
+    named = [img for img in images if img["filename"] is not None]
+    if named:
+        log_dir = os.path.dirname(log_path)
+        paths = [os.path.join(log_dir, img["filename"]) for img in named]
+        indexed = index_headers(fits_index) if fits_index is not None else {}
+        results = [None] * len(paths)
+        to_read = []
+        for i, fits_file_path in enumerate(paths):
+            hdr = indexed.get(os.path.abspath(fits_file_path))
+            if hdr is None:
+                to_read.append(i)
+            else:
+                results[i] = (hdr.get("DATE-OBS"), None)
+        if to_read:
+            with ThreadPoolExecutor(max_workers=min(16, len(to_read), (os.cpu_count() or 1) * 2)) as pool:
+                for i, res in zip(to_read, pool.map(_try_read_date_obs, [paths[i] for i in to_read])):
+                    results[i] = res
+        for img_dict, fits_file_path, (date_obs, err) in zip(named, paths, results):
+            if err is not None:
+                print(f"Error reading FITS header from {fits_file_path}: {err}")
+            elif date_obs:
+                try:
+                    # DATE-OBS is expected in ISO format, e.g., '2025-03-01T03:58:35.470867'
+                    obs_dt = datetime.fromisoformat(date_obs)
+                except Exception as e:
+                    print(f"Error reading FITS header from {fits_file_path}: {e}")
+                    continue
+                img_dict["start_dt"] = obs_dt
+                img_dict["end_dt"] = obs_dt + timedelta(seconds=img_dict["exposure_s"])
 
     # Fallback: if the autorun log never listed FITS names, map exposures to the directory's FITS files
-    log_dir = os.path.dirname(log_path)
-    try:
-        fits_files = sorted(
-            fname for fname in os.listdir(log_dir)
-            if fname.lower().endswith(('.fit', '.fits'))
-        )
-        for img_dict, fname in zip(images, fits_files):
-            if img_dict.get("filename") is None:
-                img_dict["filename"] = fname
-    except Exception:
-        # If directory listing fails, silently continue
-        pass
+    if any(img_dict["filename"] is None for img_dict in images):
+        log_dir = os.path.dirname(log_path)
+        try:
+            if names is None:
+                names = list_file_names(log_dir)
+            fits_files = sorted(
+                fname for fname in names
+                if fname.lower().endswith(('.fit', '.fits'))
+            )
+            for img_dict, fname in zip(images, fits_files):
+                if img_dict.get("filename") is None:
+                    img_dict["filename"] = fname
+        except Exception:
+            # If directory listing fails, silently continue
+            pass
     return images
 
 # -------------------------
 # 3) Parse the PHD2 Guide Log
 # -------------------------
+# Compiled once and matched against raw bytes, so lines are never decoded
+GUIDE_BEGINS_PAT = re.compile(rb'Guiding Begins at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+STAR_LOST_PAT    = re.compile(rb'^(\S+\s+\S+).*Guide star lost')
+# Data rows are CSV: Frame,Time,mount,dx,dy,RARawDistance,DECRawDistance,...
+# Rows vary in length (errors append a description), so read_csv gets a fixed,
+# generous set of column names and shorter rows are padded with NaN.
+# (usecols cannot be combined with padded names, so the needed columns are picked afterwards.)
+GUIDE_MOUNT_MARK = b',"Mount",'
+_GUIDE_CSV_NAMES = list(range(32))
+
+def _read_guide_rows(rows):
+    """
+    Parse one guiding session's raw data rows with pandas' C engine.
+    Returns (rel_t, ra_pix, dec_pix) float64 arrays for rows with a full set of offsets.
+    """
+    df = pd.read_csv(io.BytesIO(b"\n".join(rows)), header=None, engine='c',
+                     names=_GUIDE_CSV_NAMES)
+    # Time, dx, dy, RARawDistance, DECRawDistance must all be numeric (as the old regex required)
+    numeric = df[[1, 3, 4, 5, 6]].apply(pd.to_numeric, errors='coerce')
+    ok = (df[2] == "Mount").to_numpy() & numeric.notna().all(axis=1).to_numpy()
+    return (numeric[1].to_numpy(np.float64)[ok],
+            numeric[5].to_numpy(np.float64)[ok],
+            numeric[6].to_numpy(np.float64)[ok])
+
+@lru_cache(maxsize=4096)
+def _parse_lost_stamp(stamp):
+    """Star-lost stamp (bytes) -> datetime; accepts "YYYY/MM/DD HH:MM:SS" and "YYYY-MM-DD HH:MM:SS".
+    Memoised because several events often share the same second."""
+    return datetime.fromisoformat(stamp.decode('ascii', errors='replace').replace('/', '-'))
+
 def parse_phd2_log(log_path):
     """
     Gather:
-      - frames[]: each with abs_time, ra_pix, dec_pix
-      - star_lost_times[]: datetimes of "Guide star lost"
+      - frames: GuideFrames columns (abs time, ra_pix, dec_pix)
+      - star_lost_times: datetime64[us] array of "Guide star lost" times
 
     PHD2 lines:
       "Guiding Begins at 2025-01-25 20:17:44"
@@ -179,62 +269,100 @@ def parse_phd2_log(log_path):
     """
     if not log_path or not os.path.exists(log_path):
         print(f"PHD2 log not found: {log_path}")
-        return [], []
+        return GuideFrames.empty(), np.empty(0, dtype="datetime64[us]")
 
-    frames = []
+    # Data rows are buffered raw per guiding session and handed to pandas in one go
+    segments = []         # (session start, raw data rows)
     star_lost_times = []
 
-    time_format_phd2 = "%Y-%m-%d %H:%M:%S"
-    current_session_start = None
+    with open(log_path, 'rb') as f:
+        lines = f.read().splitlines()
 
-    # Regex for data lines
-    guide_data_pat = re.compile(
-        r'^(\d+),([\d.]+),"Mount",([-+\d.]+),([-+\d.]+),([-+\d.]+),([-+\d.]+),'
-    )
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
+        # 1) Guide data line, e.g. "1,0.576,"Mount",-0.057,0.104,-0.097,0.071,..."
+        #    Star-lost lines also start with a digit (their date), so they fail the marker test.
+        if line[:1].isdigit() and GUIDE_MOUNT_MARK in line:
+            if segments:
+                segments[-1][1].append(line)
+            continue
 
-            # 1) "Guiding Begins at 2025-01-25 20:17:44"
-            mbeg = re.search(r'Guiding Begins at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
+        # 2) "Guiding Begins at 2025-01-25 20:17:44"
+        if b'Guiding Begins at' in line:
+            mbeg = GUIDE_BEGINS_PAT.search(line)
             if mbeg:
-                dt_str = mbeg.group(1)
-                current_session_start = datetime.strptime(dt_str, time_format_phd2)
-                continue
+                segments.append((datetime.fromisoformat(mbeg.group(1).decode('ascii')), []))
 
-            # 2) star lost line?
-            mlost = re.search(r'^(\S+\s+\S+).*Guide star lost', line)
+        # 3) star lost line?
+        elif b'Guide star lost' in line:
+            mlost = STAR_LOST_PAT.match(line)
             if mlost:
-                lost_dt_str = mlost.group(1)
-                tried = False
-                for fmt in ["%Y/%m/%d %H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
-                    try:
-                        lost_dt = datetime.strptime(lost_dt_str, fmt)
-                        star_lost_times.append(lost_dt)
-                        tried = True
-                        break
-                    except ValueError:
-                        pass
-                if not tried:
+                try:
+                    star_lost_times.append(_parse_lost_stamp(mlost.group(1)))
+                except ValueError:
                     pass
 
-            # 3) Guide data line, e.g. "1,0.576,"Mount",-0.057,0.104,-0.097,0.071,..."
-            mdata = guide_data_pat.match(line)
-            if mdata and current_session_start:
-                frame_idx = int(mdata.group(1))
-                rel_t     = float(mdata.group(2))
-                ra_raw    = float(mdata.group(5))
-                dec_raw   = float(mdata.group(6))
-
-                abs_time  = current_session_start + timedelta(seconds=rel_t)
-                frames.append({
-                    "abs_time": abs_time,
-                    "ra_pix":   ra_raw,
-                    "dec_pix":  dec_raw
-                })
-
-    return frames, star_lost_times
+    # One set of columns sized from the buffered row count (an upper bound: rows without a
+    # full set of offsets are dropped), filled session by session and trimmed at the end
+    n_rows = sum(len(rows) for _, rows in segments)
+    abs_dt = np.empty(n_rows, dtype="datetime64[us]")
+    ra_all = np.empty(n_rows, np.float32)
+    dec_all = np.empty(n_rows, np.float32)
+    n = 0
+    for session_start, rows in segments:
+        if not rows:
+            continue
+        rel_t, ra_pix, dec_pix = _read_guide_rows(rows)
+        end = n + rel_t.size
+        # Each frame's time = session start + offset, rounded to whole microseconds
+        offsets_us = np.rint(rel_t * 1e6).astype(np.int64).astype("timedelta64[us]")
+        np.add(np.datetime64(session_start, "us"), offsets_us, out=abs_dt[n:end])
+        ra_all[n:end] = ra_pix
+        dec_all[n:end] = dec_pix
+        n = end
+
+    # concat of a single part only checks the time order (sorting if sessions overlap)
+    frames = GuideFrames.concat([GuideFrames(abs_dt[:n], ra_all[:n], dec_all[:n])])
+    return frames, np.array(star_lost_times, dtype="datetime64[us]")
+
+# Parsed logs are memoised in REPORTS_DIR, keyed by (path, mtime, size)
+PHD2_CACHE_NAME = ".phd2_log_cache.pkl"
+_PHD2_CACHE_VERSION = 4
+
+def parse_phd2_logs_cached(log_paths):
+    """
+    parse_phd2_log for each of 'log_paths', in order.
+    PHD2 logs are append-only, so a finished log is parsed once and later runs load its
+    (frames, star_lost_times) from the cache; a log that is still growing is re-parsed and
+    its stale entry replaced.
+    """
+    try:
+        cache_path = out_path(PHD2_CACHE_NAME)
+    except Exception:
+        return [parse_phd2_log(p) for p in log_paths]  # no REPORTS_DIR; parse everything
+
+    cache = load_cache(cache_path, _PHD2_CACHE_VERSION)
+    results = []
+    dirty = False
+    for log_path in log_paths:
+        try:
+            key = file_key(log_path)
+        except OSError:
+            results.append(parse_phd2_log(log_path))  # let the parser report it
+            continue
+        if key not in cache:
+            for stale in [k for k in cache if k[0] == key[0]]:
+                del cache[stale]
+            cache[key] = parse_phd2_log(log_path)
+            dirty = True
+        results.append(cache[key])
+
+    if dirty:
+        save_cache(cache_path, cache, _PHD2_CACHE_VERSION, tag="phd2_analysis")
+    return results
 
 # -------------------------
 # 4) Compute RMS per image
@@ -242,13 +370,11 @@ def parse_phd2_log(log_path):
 def compute_rms_for_image(image, frames):
     """
     For a single image [start_dt, end_dt], gather frames, compute RMS RA/DEC/Total in arcsec + µm.
+    *frames* is a time-sorted GuideFrames, so the window is two binary searches.
     Returns a dict with the values plus n_frames used.
     """
-    start_t = image["start_dt"]
-    end_t   = image["end_dt"]
-
-    subset = [fr for fr in frames if start_t <= fr["abs_time"] <= end_t]
-    n = len(subset)
+    window = frames.window(image["start_dt"], image["end_dt"])
+    n = len(window)
 
     if n == 0:
         return {
@@ -257,148 +383,203 @@ def compute_rms_for_image(image, frames):
             "n_frames":  0
         }
 
-    ra_as  = [fr["ra_pix"]  * PIXEL_SCALE_ARCSEC for fr in subset]
-    dec_as = [fr["dec_pix"] * PIXEL_SCALE_ARCSEC for fr in subset]
-    ra_um  = [fr["ra_pix"]  * PIXEL_SIZE_UM     for fr in subset]
-    dec_um = [fr["dec_pix"] * PIXEL_SIZE_UM     for fr in subset]
-
-    def rms(vals):
-        return math.sqrt(sum(v*v for v in vals) / len(vals))
+    ra_pix  = window.ra_pix
+    dec_pix = window.dec_pix
 
-    total_as = [math.sqrt(rx*rx + dx*dx) for (rx,dx) in zip(ra_as, dec_as)]
-    total_um = [math.sqrt(rx*rx + dx*dx) for (rx,dx) in zip(ra_um, dec_um)]
+    # RMS is linear in the scale factor, so reduce once in pixels and scale the results
+    ra_rms, dec_rms, tot_rms = rms3(ra_pix, dec_pix, 1.0)
 
     return {
-        "rms_ra_as":    rms(ra_as),
-        "rms_dec_as":   rms(dec_as),
-        "rms_total_as": rms(total_as),
-        "rms_ra_um":    rms(ra_um),
-        "rms_dec_um":   rms(dec_um),
-        "rms_total_um": rms(total_um),
+        "rms_ra_as":    ra_rms  * PIXEL_SCALE_ARCSEC,
+        "rms_dec_as":   dec_rms * PIXEL_SCALE_ARCSEC,
+        "rms_total_as": tot_rms * PIXEL_SCALE_ARCSEC,
+        "rms_ra_um":    ra_rms  * PIXEL_SIZE_UM,
+        "rms_dec_um":   dec_rms * PIXEL_SIZE_UM,
+        "rms_total_um": tot_rms * PIXEL_SIZE_UM,
         "n_frames":     n
     }
 
 def count_star_lost_for_image(image, star_lost_times):
-    """Number of star-lost events in [start_dt, end_dt]."""
-    s = image["start_dt"]
-    e = image["end_dt"]
-    return sum(1 for t in star_lost_times if s <= t <= e)
+    """Number of star-lost events in [start_dt, end_dt]; *star_lost_times* is a sorted datetime64[us] array."""
+    lo = np.searchsorted(star_lost_times, to_datetime64(image["start_dt"]), side="left")
+    hi = np.searchsorted(star_lost_times, to_datetime64(image["end_dt"]), side="right")
+    return int(hi - lo)
+
+def _image_times(images):
+    """(start, end) datetime64[us] arrays (naive UTC) of *images*."""
+    # One vectorised conversion for all starts and ends; utc=True treats naive datetimes
+    # as UTC and converts aware ones, as to_datetime64 does
+    stamps = pd.to_datetime([img["start_dt"] for img in images] + [img["end_dt"] for img in images], utc=True)
+    stamps = stamps.tz_convert(None).to_numpy("datetime64[us]")
+    return stamps[:len(images)], stamps[len(images):]
+
+def _image_bounds(images, times):
+    """[lo, hi) index bounds of every image's [start_dt, end_dt] window in sorted *times*."""
+    starts, ends = _image_times(images)
+    return np.searchsorted(times, starts, side="left"), np.searchsorted(times, ends, side="right")
+
+def compute_rms_for_images(images, frames):
+    """
+    compute_rms_for_image for all *images* at once. All windows are located with one
+    np.searchsorted call each for starts and ends, and every window's sums of squares
+    come out of a single np.add.reduceat, so the cost is O(frames + images) in C.
+    Returns a dict of per-image lists (None where an image has no frames), keyed like
+    compute_rms_for_image's result.
+    """
+    lo, hi = _image_bounds(images, frames.abs_dt_utc)
+    n = hi - lo
+
+    # Rows are ra^2 / dec^2 with a trailing zero so an end bound of len(frames) is a valid
+    # index. Interleaving [lo0, hi0, lo1, hi1, ...] makes every even reduceat slot the sum
+    # over one image's window; the odd slots (gaps between images) are discarded.
+    sq = np.zeros((2, len(frames) + 1))
+    # Offsets are float32; square and sum them in float64
+    np.multiply(frames.ra_pix, frames.ra_pix, out=sq[0, :-1], dtype=np.float64)
+    np.multiply(frames.dec_pix, frames.dec_pix, out=sq[1, :-1], dtype=np.float64)
+    sums = np.add.reduceat(sq, np.column_stack((lo, hi)).ravel(), axis=1)[:, ::2]
+
+    has = n > 0
+    safe_n = np.where(has, n, 1)
+    # reduceat yields the single element at lo for an empty window; masked out below
+    ra_rms  = np.sqrt(sums[0] / safe_n)
+    dec_rms = np.sqrt(sums[1] / safe_n)
+    tot_rms = np.sqrt((sums[0] + sums[1]) / safe_n)
+
+    def per_image(vals, scale):
+        return [float(v) * scale if ok else None for v, ok in zip(vals, has)]
 
-def compute_overall_rms(frames):
-    """Compute overall RMS for the entire session's frames."""
-    if not frames:
-        return None
+    return {
+        "rms_ra_as":    per_image(ra_rms,  PIXEL_SCALE_ARCSEC),
+        "rms_dec_as":   per_image(dec_rms, PIXEL_SCALE_ARCSEC),
+        "rms_total_as": per_image(tot_rms, PIXEL_SCALE_ARCSEC),
+        "rms_ra_um":    per_image(ra_rms,  PIXEL_SIZE_UM),
+        "rms_dec_um":   per_image(dec_rms, PIXEL_SIZE_UM),
+        "rms_total_um": per_image(tot_rms, PIXEL_SIZE_UM),
+        "n_frames":     n,
+    }
 
-    ra_pix_vals  = [fr["ra_pix"] for fr in frames]
-    dec_pix_vals = [fr["dec_pix"] for fr in frames]
+def count_star_lost_for_images(images, star_lost_times):
+    """count_star_lost_for_image for all *images*; *star_lost_times* is a sorted datetime64[us] array."""
+    lo, hi = _image_bounds(images, star_lost_times)
+    return hi - lo
 
-    def rms(vals):
-        return math.sqrt(sum(v*v for v in vals) / len(vals))
+def compute_overall_rms(frames):
+    """Compute overall RMS for the entire session's frames (GuideFrames)."""
+    if len(frames) == 0:
+        return None
 
-    ra_as_vals  = [v * PIXEL_SCALE_ARCSEC for v in ra_pix_vals]
-    dec_as_vals = [v * PIXEL_SCALE_ARCSEC for v in dec_pix_vals]
-    tot_as_vals = [math.sqrt((r*r)+(d*d)) for r,d in zip(ra_as_vals, dec_as_vals)]
+    ra_pix_vals, dec_pix_vals = frames.ra_pix, frames.dec_pix
 
-    ra_um_vals  = [v * PIXEL_SIZE_UM for v in ra_pix_vals]
-    dec_um_vals = [v * PIXEL_SIZE_UM for v in dec_pix_vals]
-    tot_um_vals = [math.sqrt((r*r)+(d*d)) for r,d in zip(ra_um_vals, dec_um_vals)]
+    ra_rms, dec_rms, tot_rms = rms3(ra_pix_vals, dec_pix_vals, 1.0)
 
     return {
-        "ra_as":  rms(ra_as_vals),
-        "dec_as": rms(dec_as_vals),
-        "tot_as": rms(tot_as_vals),
-        "ra_um":  rms(ra_um_vals),
-        "dec_um": rms(dec_um_vals),
-        "tot_um": rms(tot_um_vals),
+        "ra_as":  ra_rms  * PIXEL_SCALE_ARCSEC,
+        "dec_as": dec_rms * PIXEL_SCALE_ARCSEC,
+        "tot_as": tot_rms * PIXEL_SCALE_ARCSEC,
+        "ra_um":  ra_rms  * PIXEL_SIZE_UM,
+        "dec_um": dec_rms * PIXEL_SIZE_UM,
+        "tot_um": tot_rms * PIXEL_SIZE_UM,
     }
 
-# Create a dictionary of PHD2 parameter descriptions - add after the "def parse_phd2_log_header(log_path):" function
+# Descriptions for PHD2 log header parameters, built once at import
+_PHD2_PARAM_DESCRIPTIONS = {
+    "PHD2 version": "Version number of the PHD2 software used",
+    "Log version": "Version number of the log format (should be 2.5)",
+    "Log enabled at": "Timestamp when logging was started",
+    "Guiding Status": "Status message for when guiding began",
+    "Exposure": "Guide camera exposure time in seconds",
+    "Pixel scale": "Size of guide camera pixels in arcseconds",
+    "Camera": "Model of guide camera used",
+    "Mount": "Type of mount connected to PHD2",
+    "X guide algorithm": "Algorithm used for RA axis guiding",
+    "Y guide algorithm": "Algorithm used for DEC axis guiding",
+    "Algorithm": "Guiding algorithm used (usually 'Hysteresis')",
+    "Dither": "Indicates which axes are being dithered during guiding",
+    "Dither scale": "Amount of random offset applied during dithering",
+    "Image noise reduction": "Type of noise reduction applied to guide camera images",
+    "Guide-frame time lapse": "Time between guide frames in seconds",
+    "Binning": "Binning level used for guide camera",
+    "Focal length": "Focal length of the guide scope in millimeters",
+    "Search region": "Size of search area for guide star in pixels",
+    "Star mass tolerance": "Allowed percentage change in guide star brightness",
+    "Star position tolerance": "Allowed sudden change in star position (pixels)",
+    "Equipment Profile": "Name of the equipment profile being used",
+    "gain": "Guide camera gain setting",
+    "full size": "Full resolution of the guide camera in pixels",
+    "pixel size": "Physical size of guide camera pixels in microns",
+    "xAngle": "Calibration angle for RA axis in degrees",
+    "xRate": "Guide rate for RA axis (multiple of sidereal)",
+    "yAngle": "Calibration angle for DEC axis in degrees",
+    "yRate": "Guide rate for DEC axis (multiple of sidereal)",
+    "parity": "Mount calibration parity values",
+    "Hysteresis": "Damping factor to reduce oscillations (0-1)",
+    "Aggression": "How aggressively corrections are applied (0-1)",
+    "Minimum move": "Smallest correction that will be sent to mount (pixels)",
+    "RA Aggressiveness": "How aggressively PHD2 corrects RA errors (0-1)",
+    "RA Hysteresis": "Damping factor for RA corrections (0-100%)",
+    "RA Min move": "Minimum mount movement in RA to respond to errors (pixels)",
+    "Dec Aggressiveness": "How aggressively PHD2 corrects DEC errors (0-1)",
+    "Dec Hysteresis": "Damping factor for DEC corrections (0-100%)",
+    "Dec Min move": "Minimum mount movement in DEC to respond to errors (pixels)",
+    "DEC guide mode": "Type of declination guiding (auto, north, south, etc.)",
+    "Backlash comp": "Amount of declination backlash compensation (ms)",
+    "pulse": "Backlash compensation pulse duration in milliseconds",
+    "Calibration step": "Distance in pixels between calibration steps",
+    "Max RA duration": "Maximum pulse length for RA corrections (ms)",
+    "Max DEC duration": "Maximum pulse length for Dec corrections (ms)",
+    "RA Guide Speed": "Mount RA guiding speed as a multiple of sidereal rate",
+    "Dec Guide Speed": "Mount DEC guiding speed as a multiple of sidereal rate",
+    "CalibrationState": "Status of mount calibration",
+    "Timestamp": "Type of timestamps used in the log",
+    "Cal Dec": "Declination coordinate used during calibration",
+    "Last Cal Issue": "Problems encountered during the last calibration",
+    "Dec": "Current declination of the telescope",
+    "Hour angle": "Current hour angle of the telescope",
+    "Pier side": "Side of pier the telescope is on (East/West)",
+    "Rotator pos": "Position angle of the camera rotator",
+    "Lock position": "Reference position of the guide star",
+    "Star position": "Current position of the guide star",
+    "HFD": "Half-flux diameter of the guide star (measure of focus)",
+    "XSize": "Width of guide camera chip in pixels",
+    "YSize": "Height of guide camera chip in pixels",
+    "BinningX": "Horizontal binning factor (1=no binning)",
+    "BinningY": "Vertical binning factor (1=no binning)",
+    "MaxADU": "Maximum pixel value supported by the guide camera",
+    "CalibrationDetails": "Information about the calibration process",
+    "INFO": "Additional information messages from PHD2",
+    "Calibration Dec": "Declination coordinate used during calibration",
+    "Calibration RA": "Right ascension coordinate used during calibration",
+    "CalibrationDistance": "Length of calibration movement in pixels",
+    "DecSwapEnabled": "Whether PHD2 can automatically swap declination direction",
+    "UseDecComp": "Whether declination compensation is enabled",
+    "AO": "Adaptive optics device information if present",
+    "Last Cal": "When the last calibration was performed",
+    "Polar alignment error": "Amount of polar alignment error detected (arcmin)",
+    "Side of pier": "Telescope position relative to mount (east or west)",
+    "FastSwitch": "Whether fast DEC direction switching is enabled"
+}
+
+# Y-axis algorithm line packs four settings without comma separators, e.g.
+# "Y guide algorithm = Resist Switch, Minimum move = 0.100 Aggression = 30% FastSwitch = enabled"
+_Y_ALGO_KEYS = ("Y guide algorithm", "Minimum move", "Aggression", "FastSwitch")
+_Y_ALGO_RE = re.compile(
+    r'Y guide algorithm\s*=\s*([^,]+),\s*Minimum move\s*=\s*(\S+)\s+Aggression\s*=\s*(\S+)\s+FastSwitch\s*=\s*(\S+)'
+)
+
 def get_phd2_parameter_descriptions():
     """Returns a dictionary with descriptions for PHD2 log header parameters"""
-    return {
-        "PHD2 version": "Version number of the PHD2 software used",
-        "Log version": "Version number of the log format (should be 2.5)",
-        "Log enabled at": "Timestamp when logging was started",
-        "Guiding Status": "Status message for when guiding began",
-        "Exposure": "Guide camera exposure time in seconds",
-        "Pixel scale": "Size of guide camera pixels in arcseconds",
-        "Camera": "Model of guide camera used",
-        "Mount": "Type of mount connected to PHD2",
-        "X guide algorithm": "Algorithm used for RA axis guiding",
-        "Y guide algorithm": "Algorithm used for DEC axis guiding",
-        "Algorithm": "Guiding algorithm used (usually 'Hysteresis')",
-        "Dither": "Indicates which axes are being dithered during guiding",
-        "Dither scale": "Amount of random offset applied during dithering",
-        "Image noise reduction": "Type of noise reduction applied to guide camera images",
-        "Guide-frame time lapse": "Time between guide frames in seconds",
-        "Binning": "Binning level used for guide camera",
-        "Focal length": "Focal length of the guide scope in millimeters",
-        "Search region": "Size of search area for guide star in pixels",
-        "Star mass tolerance": "Allowed percentage change in guide star brightness",
-        "Star position tolerance": "Allowed sudden change in star position (pixels)",
-        "Equipment Profile": "Name of the equipment profile being used",
-        "gain": "Guide camera gain setting",
-        "full size": "Full resolution of the guide camera in pixels",
-        "pixel size": "Physical size of guide camera pixels in microns",
-        "xAngle": "Calibration angle for RA axis in degrees",
-        "xRate": "Guide rate for RA axis (multiple of sidereal)",
-        "yAngle": "Calibration angle for DEC axis in degrees",
-        "yRate": "Guide rate for DEC axis (multiple of sidereal)",
-        "parity": "Mount calibration parity values",
-        "Hysteresis": "Damping factor to reduce oscillations (0-1)",
-        "Aggression": "How aggressively corrections are applied (0-1)",
-        "Minimum move": "Smallest correction that will be sent to mount (pixels)",
-        "RA Aggressiveness": "How aggressively PHD2 corrects RA errors (0-1)",
-        "RA Hysteresis": "Damping factor for RA corrections (0-100%)",
-        "RA Min move": "Minimum mount movement in RA to respond to errors (pixels)",
-        "Dec Aggressiveness": "How aggressively PHD2 corrects DEC errors (0-1)",
-        "Dec Hysteresis": "Damping factor for DEC corrections (0-100%)",
-        "Dec Min move": "Minimum mount movement in DEC to respond to errors (pixels)",
-        "DEC guide mode": "Type of declination guiding (auto, north, south, etc.)",
-        "Backlash comp": "Amount of declination backlash compensation (ms)",
-        "pulse": "Backlash compensation pulse duration in milliseconds",
-        "Calibration step": "Distance in pixels between calibration steps",
-        "Max RA duration": "Maximum pulse length for RA corrections (ms)",
-        "Max DEC duration": "Maximum pulse length for Dec corrections (ms)",
-        "RA Guide Speed": "Mount RA guiding speed as a multiple of sidereal rate",
-        "Dec Guide Speed": "Mount DEC guiding speed as a multiple of sidereal rate",
-        "CalibrationState": "Status of mount calibration",
-        "Timestamp": "Type of timestamps used in the log",
-        "Cal Dec": "Declination coordinate used during calibration",
-        "Last Cal Issue": "Problems encountered during the last calibration",
-        "Dec": "Current declination of the telescope",
-        "Hour angle": "Current hour angle of the telescope",
-        "Pier side": "Side of pier the telescope is on (East/West)",
-        "Rotator pos": "Position angle of the camera rotator",
-        "Lock position": "Reference position of the guide star",
-        "Star position": "Current position of the guide star",
-        "HFD": "Half-flux diameter of the guide star (measure of focus)",
-        "XSize": "Width of guide camera chip in pixels",
-        "YSize": "Height of guide camera chip in pixels",
-        "BinningX": "Horizontal binning factor (1=no binning)",
-        "BinningY": "Vertical binning factor (1=no binning)",
-        "MaxADU": "Maximum pixel value supported by the guide camera",
-        "CalibrationDetails": "Information about the calibration process",
-        "INFO": "Additional information messages from PHD2",
-        "Calibration Dec": "Declination coordinate used during calibration",
-        "Calibration RA": "Right ascension coordinate used during calibration",
-        "CalibrationDistance": "Length of calibration movement in pixels",
-        "DecSwapEnabled": "Whether PHD2 can automatically swap declination direction",
-        "UseDecComp": "Whether declination compensation is enabled",
-        "AO": "Adaptive optics device information if present",
-        "Last Cal": "When the last calibration was performed",
-        "Polar alignment error": "Amount of polar alignment error detected (arcmin)",
-        "Side of pier": "Telescope position relative to mount (east or west)",
-        "FastSwitch": "Whether fast DEC direction switching is enabled"
-    }
-    
+    return _PHD2_PARAM_DESCRIPTIONS
+
+# Upper bound on how much of a PHD2 log is read as header
+MAX_HEADER_CHARS = 256 * 1024
+
 # Update the parse_phd2_log_header function to add descriptions to the DataFrame
 def parse_phd2_log_header(log_path):
     """
     Parse the header section of a PHD2 log file and extract key parameters
     Returns a DataFrame with the header information.
     """
-    header_data = []
+    header_columns = None
     parameter_values = {}
     
     try:
@@ -409,20 +590,26 @@ def parse_phd2_log_header(log_path):
         header_lines = []
         data_section_found = False
         
+        # The header is a few KB at the top of the log; never read into the (possibly
+        # 100+ MB) data section, even when the marker below is missing
         with open(log_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines in the header
-                if not line:
-                    continue
-                    
-                # Stop when the data section marker is found
-                if line.startswith("Frame,Time,"):
-                    data_section_found = True
-                    break
-                
-                # Collect header lines
-                header_lines.append(line)
+            header_text = f.read(MAX_HEADER_CHARS)
+        if len(header_text) == MAX_HEADER_CHARS:
+            header_text = header_text.rsplit("\n", 1)[0]  # drop a line cut by the limit
+
+        for line in header_text.splitlines():
+            line = line.strip()
+            # Skip empty lines in the header
+            if not line:
+                continue
+
+            # Stop when the data section marker is found
+            if line.startswith("Frame,Time,"):
+                data_section_found = True
+                break
+
+            # Collect header lines
+            header_lines.append(line)
         
         if not data_section_found:
             print(f"[phd2_analysis] Warning: Data section marker not found in {log_path}")
@@ -431,7 +618,7 @@ def parse_phd2_log_header(log_path):
             print(f"[phd2_analysis] Found {len(header_lines)} header lines in PHD2 log")
             
         # Get the parameter descriptions
-        parameter_descriptions = get_phd2_parameter_descriptions()
+        parameter_descriptions = _PHD2_PARAM_DESCRIPTIONS
 
         # Process each header line and extract key information
         for line_num, line in enumerate(header_lines):
@@ -479,8 +666,16 @@ def parse_phd2_log_header(log_path):
             # General Key = Value parsing for all other lines
             if "=" in line:
                 try:
+                    # The Y guide algorithm line must be checked first: its settings are not
+                    # comma separated, so the multi-part split below would merge them
+                    m_y = _Y_ALGO_RE.search(line) if "Y guide algorithm" in line else None
+                    if m_y:
+                        values = [v.strip() for v in m_y.groups()]
+                        parameter_values.update(zip(_Y_ALGO_KEYS, values))
+                        dbg(f"[phd2_analysis DEBUG] Parsed Y algorithm line: {dict(zip(_Y_ALGO_KEYS, values))}")
+
                     # Handle case where line has multiple KEY=VALUE pairs
-                    if line.count("=") > 1 and "," in line:
+                    elif line.count("=") > 1 and "," in line:
                         # Line like "Dither = both axes, Dither scale = 1.000, ..."
                         parts = line.split(',')
                         for part in parts:
@@ -488,40 +683,6 @@ def parse_phd2_log_header(log_path):
                                 key, value = part.split("=", 1)
                                 parameter_values[key.strip()] = value.strip()
                                 dbg(f"[phd2_analysis DEBUG] Found multi-part KV: {key.strip()}='{value.strip()}'")
-                    
-                    # Special handling for Y guide algorithm line which has a complex format
-                    elif "Y guide algorithm" in line and "Minimum move" in line and "Aggression" in line:
-                        # Parse complex Y guide algorithm line
-                        # Example: "Y guide algorithm = Resist Switch, Minimum move = 0.100 Aggression = 30% FastSwitch = enabled"
-                        try:
-                            # Extract Y guide algorithm
-                            algo_part = line.split("Y guide algorithm =", 1)[1].split(",", 1)[0].strip()
-                            parameter_values["Y guide algorithm"] = algo_part
-                            dbg(f"[phd2_analysis DEBUG] Parsed Y algorithm: Y guide algorithm='{algo_part}'")
-                            
-                            # Extract remaining parts
-                            remaining = line.split(",", 1)[1] if "," in line else ""
-                            
-                            # Extract Minimum move
-                            if "Minimum move =" in remaining:
-                                min_move_part = remaining.split("Minimum move =", 1)[1].split("Aggression =", 1)[0].strip()
-                                parameter_values["Minimum move"] = min_move_part
-                                dbg(f"[phd2_analysis DEBUG] Parsed Y min move: Minimum move='{min_move_part}'")
-                            
-                            # Extract Aggression
-                            if "Aggression =" in remaining:
-                                aggression_part = remaining.split("Aggression =", 1)[1].split("FastSwitch =", 1)[0].strip()
-                                parameter_values["Aggression"] = aggression_part
-                                dbg(f"[phd2_analysis DEBUG] Parsed Y aggression: Aggression='{aggression_part}'")
-                            
-                            # Extract FastSwitch
-                            if "FastSwitch =" in remaining:
-                                fast_switch = remaining.split("FastSwitch =", 1)[1].strip()
-                                parameter_values["FastSwitch"] = fast_switch
-                                dbg(f"[phd2_analysis DEBUG] Parsed FastSwitch: FastSwitch='{fast_switch}'")
-                        except Exception as e:
-                            print(f"[phd2_analysis] Error parsing Y guide algorithm line: {e}")
-                            parameter_values["Y guide algorithm line"] = line
                     else:
                         # Simple KEY=VALUE line
                         key, value = line.split("=", 1)
@@ -543,23 +704,34 @@ def parse_phd2_log_header(log_path):
         if DEBUG_MODE:
             print(f"[phd2_analysis] Extracted {len(parameter_values)} parameters from header")
         
-        # Convert collected parameters to DataFrame format with descriptions
-        for key, value in parameter_values.items():
-            description = parameter_descriptions.get(key, "")
-            header_data.append({"Parameter": key, "Value": value, "Description": description})
-            
+        # Convert collected parameters to DataFrame columns with descriptions
+        header_columns = {
+            "Parameter":   list(parameter_values),
+            "Value":       list(parameter_values.values()),
+            "Description": [parameter_descriptions.get(key, "") for key in parameter_values],
+        }
+
     except Exception as e:
         print(f"[phd2_analysis] Error parsing PHD2 header from {log_path}: {e}")
 
-    return pd.DataFrame(header_data)
+    return pd.DataFrame(header_columns) if header_columns else pd.DataFrame()
 
 # -------------------------
 # 5) Main Data Generation Workflow (New Function)
 # -------------------------
-def generate_phd2_analysis_data():
-    # 1) Find logs
-    autorun_log_files = find_all_files_with_prefix(RAW_DIR, AUTORUN_LOG_PREFIX, AUTORUN_EXT)
-    phd2_log_files    = find_all_files_with_prefix(RAW_DIR, PHD2_LOG_PREFIX, PHD2_EXT)
+PER_IMAGE_COLUMNS = [
+    "Img#", "FITS_File", "Start", "End", "Lost",
+    "RMS_RA_as", "RMS_DEC_as", "RMS_TOT_as",
+    "RMS_RA_um", "RMS_DEC_um", "RMS_TOT_um", "FramesUsed",
+]
+# Start/End are kept as datetime64 in the DataFrame and only formatted on output
+PER_IMAGE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def generate_phd2_analysis_data(fits_index=None):
+    # 1) Find logs (one directory listing shared by every lookup below)
+    raw_names = list_file_names(RAW_DIR)
+    autorun_log_files = find_all_files_with_prefix(RAW_DIR, AUTORUN_LOG_PREFIX, AUTORUN_EXT, raw_names)
+    phd2_log_files    = find_all_files_with_prefix(RAW_DIR, PHD2_LOG_PREFIX, PHD2_EXT, raw_names)
 
     # Initialize return values
     per_image_df = pd.DataFrame()
@@ -579,41 +751,46 @@ def generate_phd2_analysis_data():
         print(f"[phd2_analysis] Found PHD2 Logs: {[os.path.basename(p) for p in phd2_log_files]}\n")
 
     # 2) Parse logs
-    images = parse_autorun_log(autorun_log_path)
+    images = parse_autorun_log(autorun_log_path, raw_names, fits_index)
     
-    all_frames = []
+    frame_segments = []
     all_star_lost_times = []
     first_log_processed = False
 
-    for phd2_log_path_item in phd2_log_files:
+    parsed_logs = parse_phd2_logs_cached(phd2_log_files)
+    for phd2_log_path_item, (frames_segment, star_lost_segment) in zip(phd2_log_files, parsed_logs):
         # Parse header only from the first log file found
         if not first_log_processed:
             first_phd2_header_df = parse_phd2_log_header(phd2_log_path_item)
             first_log_processed = True
 
         if DEBUG_MODE:
-            print(f"[phd2_analysis] Parsing PHD2 Log: {phd2_log_path_item}")
-        frames_segment, star_lost_segment = parse_phd2_log(phd2_log_path_item)
-        all_frames.extend(frames_segment)
-        all_star_lost_times.extend(star_lost_segment)
+            print(f"[phd2_analysis] Parsed PHD2 Log: {phd2_log_path_item}")
+        frame_segments.append(frames_segment)
+        all_star_lost_times.append(star_lost_segment)
         if DEBUG_MODE and frames_segment:
-            print(f"  -> Found {len(frames_segment)} frames, time range: {frames_segment[0]['abs_time']} to {frames_segment[-1]['abs_time']}")
+            seg_times = frames_segment.abs_dt_utc
+            print(f"  -> Found {len(frames_segment)} frames, time range: {seg_times[0].item()} to {seg_times[-1].item()}")
         elif DEBUG_MODE:
             print(f"  -> No frames found in this segment.")
 
-    all_frames.sort(key=lambda f: f['abs_time'])
-    all_star_lost_times = sorted(list(set(all_star_lost_times)))
+    all_frames = GuideFrames.concat(frame_segments)
+    # Sorted and de-duplicated in one pass, ready for the searchsorted counts below
+    if all_star_lost_times:
+        all_star_lost_times = np.unique(np.concatenate(all_star_lost_times))
+    else:
+        all_star_lost_times = np.empty(0, dtype="datetime64[us]")
 
     if DEBUG_MODE:
-        fits_files = [f for f in os.listdir(RAW_DIR) if f.lower().endswith(('.fit', '.fits'))]
+        fits_files = [f for f in raw_names if f.lower().endswith(('.fit', '.fits'))]
         dbg(f"[phd2_analysis DEBUG] FITS files in RAW_DIR: {fits_files}")
         dbg(f"[phd2_analysis DEBUG] Autorun log image filenames: {[img['filename'] for img in images]}")
         for img in images:
             dbg(f"[phd2_analysis DEBUG] Image {img['filename']} start: {img['start_dt']}")
         if all_frames:
             dbg(f"[phd2_analysis DEBUG] Total combined guide frames: {len(all_frames)}")
-            dbg(f"[phd2_analysis DEBUG] First 5 combined guide frame times: {[fr['abs_time'] for fr in all_frames[:5]]}")
-            dbg(f"[phd2_analysis DEBUG] Last 5 combined guide frame times: {[fr['abs_time'] for fr in all_frames[-5:]]}")
+            dbg(f"[phd2_analysis DEBUG] First 5 combined guide frame times: {all_frames.abs_dt_utc[:5].tolist()}")
+            dbg(f"[phd2_analysis DEBUG] Last 5 combined guide frame times: {all_frames.abs_dt_utc[-5:].tolist()}")
         else:
             dbg("[phd2_analysis DEBUG] No guide frames parsed from any PHD2 log.")
 
@@ -623,65 +800,47 @@ def generate_phd2_analysis_data():
         print("[phd2_analysis] No guide frames found in PHD2 log.")
 
     # 3) Compute per-image RMS + star-lost
-    results_list = [] # Store dictionaries for DataFrame creation
-    for img in images:
-        metrics   = compute_rms_for_image(img, all_frames)
-        lost_cnt  = count_star_lost_for_image(img, all_star_lost_times)
-        row = {
-            "Img#":            img["image_num"],
-            "FITS_File":       img["filename"] or "N/A",
-            "Start":           img["start_dt"].strftime("%Y-%m-%d %H:%M:%S"),
-            "End":             img["end_dt"].strftime("%Y-%m-%d %H:%M:%S"),
-            "Lost":            lost_cnt,
-            "RMS_RA_as":       metrics["rms_ra_as"],
-            "RMS_DEC_as":      metrics["rms_dec_as"],
-            "RMS_TOT_as":      metrics["rms_total_as"],
-            "RMS_RA_um":       metrics["rms_ra_um"],
-            "RMS_DEC_um":      metrics["rms_dec_um"],
-            "RMS_TOT_um":      metrics["rms_total_um"],
-            "FramesUsed":      metrics["n_frames"]
-        }
-        results_list.append(row)
-    
-    per_image_df = pd.DataFrame(results_list)
+    # Every column is built whole (arrays where typed) so the DataFrame is constructed once
+    columns = {name: [] for name in PER_IMAGE_COLUMNS}
+    if images:
+        # Windows for every image are resolved in a single vectorised pass
+        metrics = compute_rms_for_images(images, all_frames)
+        columns["Img#"]       = np.fromiter((img["image_num"] for img in images), dtype=np.int64, count=len(images))
+        columns["FITS_File"]  = [img["filename"] or "N/A" for img in images]
+        columns["Start"], columns["End"] = _image_times(images)
+        columns["Lost"]       = count_star_lost_for_images(images, all_star_lost_times)
+        columns["RMS_RA_as"]  = metrics["rms_ra_as"]
+        columns["RMS_DEC_as"] = metrics["rms_dec_as"]
+        columns["RMS_TOT_as"] = metrics["rms_total_as"]
+        columns["RMS_RA_um"]  = metrics["rms_ra_um"]
+        columns["RMS_DEC_um"] = metrics["rms_dec_um"]
+        columns["RMS_TOT_um"] = metrics["rms_total_um"]
+        columns["FramesUsed"] = metrics["n_frames"]
+
+    per_image_df = pd.DataFrame(columns) if images else pd.DataFrame()
 
     # 4) Compute overall RMS across all frames
     overall_summary_data = compute_overall_rms(all_frames)
     overall_summary_df = pd.DataFrame()
     if overall_summary_data:
-        overall_summary_df = pd.DataFrame([
-            {
-                "Description": "Overall RMS (arcsec)", 
-                "RA": overall_summary_data['ra_as'], 
-                "DEC": overall_summary_data['dec_as'], 
-                "Total": overall_summary_data['tot_as']
-            },
-            {
-                "Description": "Overall RMS (µm)",     
-                "RA": overall_summary_data['ra_um'], 
-                "DEC": overall_summary_data['dec_um'], 
-                "Total": overall_summary_data['tot_um']
-            }
-        ])
+        overall_summary_df = pd.DataFrame({
+            "Description": ["Overall RMS (arcsec)", "Overall RMS (µm)"],
+            "RA":    [overall_summary_data['ra_as'],  overall_summary_data['ra_um']],
+            "DEC":   [overall_summary_data['dec_as'], overall_summary_data['dec_um']],
+            "Total": [overall_summary_data['tot_as'], overall_summary_data['tot_um']],
+        })
 
     # 5) Print the results as a table (if debug or run standalone)
     if DEBUG_MODE or (__name__ == "__main__" and not per_image_df.empty):
-        def fmt_display(v):
-            return f"{v:.2f}" if (v is not None and isinstance(v, (int, float))) else "N/A"
-
         print("\n[phd2_analysis] Per-Image Results:")
-        header_display = [
-            "Img#","FITS_File","Start","End","Lost",
-            "RMS_RA_as","RMS_DEC_as","RMS_TOT_as",
-            "RMS_RA_um","RMS_DEC_um","RMS_TOT_um","FramesUsed"
-        ]
-        print(", ".join(header_display))
-        for r_dict in results_list:
-            print(f"{r_dict['Img#']}, {r_dict['FITS_File']}, "
-                  f"{r_dict['Start']}, {r_dict['End']}, {r_dict['Lost']}, "
-                  f"{fmt_display(r_dict['RMS_RA_as'])}, {fmt_display(r_dict['RMS_DEC_as'])}, {fmt_display(r_dict['RMS_TOT_as'])}, "
-                  f"{fmt_display(r_dict['RMS_RA_um'])}, {fmt_display(r_dict['RMS_DEC_um'])}, {fmt_display(r_dict['RMS_TOT_um'])}, "
-                  f"{r_dict['FramesUsed']}")
+        if images:
+            # One to_string call formats the whole table (floats to 2 dp, missing RMS as N/A)
+            display_df = per_image_df.assign(**{
+                name: per_image_df[name].dt.strftime(PER_IMAGE_TIME_FORMAT) for name in ("Start", "End")
+            })
+            print(display_df.to_string(index=False, float_format=lambda v: f"{v:.2f}", na_rep="N/A"))
+        else:
+            print(", ".join(PER_IMAGE_COLUMNS))
 
         if not overall_summary_df.empty:
             print("\n[phd2_analysis] Overall RMS across all frames:")
@@ -697,27 +856,28 @@ def main():
 
     if __name__ == "__main__": # Only write CSV if run as a script
         if not per_image_df.empty:
+            # One stamp for both outputs, so the pair always shares a name
+            stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
             # 6) Write CSV to the same folder
-            csv_name = f"phd2_analysis_{datetime.now():%Y%m%d-%H%M%S}.csv"
+            csv_name = f"phd2_analysis_{stamp}.csv"
             csv_path = out_path(csv_name)
             print(f"\n[phd2_analysis] Saving results to CSV: {csv_path}")
 
-            # For CSV, we might want to format numbers as strings like before
-            # Or, keep them as numbers and let Excel/etc handle formatting.
-            # For simplicity here, we write the DataFrame as is.
-            per_image_df.to_csv(csv_path, index=False)
-
-            # Append overall summary to the CSV
-            if not overall_summary_df.empty:
-                with open(csv_path, "a", newline="", encoding="utf-8") as out_file:
+            # Per-image table and overall summary go out through one buffered file handle
+            with open(csv_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as out_file:
+                per_image_df.to_csv(out_file, index=False, date_format=PER_IMAGE_TIME_FORMAT)
+                if not overall_summary_df.empty:
                     writer = csv.writer(out_file)
                     writer.writerow([]) # Blank line separator
                     writer.writerow(["Overall RMS Summary:"])
-                overall_summary_df.to_csv(csv_path, mode='a', header=True, index=False)
-            
+                    # Header + two rows: plain csv.writer output, laid out as to_csv would write them
+                    summary_writer = csv.writer(out_file, lineterminator=os.linesep)
+                    summary_writer.writerow(overall_summary_df.columns)
+                    summary_writer.writerows(overall_summary_df.itertuples(index=False))
+
             # Also write the PHD2 header to its own CSV if run standalone
             if not first_phd2_header_df.empty:
-                header_csv_name = f"phd2_header_{datetime.now():%Y%m%d-%H%M%S}.csv"
+                header_csv_name = f"phd2_header_{stamp}.csv"
                 header_csv_path = out_path(header_csv_name)
                 try:
                     first_phd2_header_df.to_csv(header_csv_path, index=False)
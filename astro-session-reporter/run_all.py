@@ -3,30 +3,71 @@ import os
 import sys
 import subprocess
 import argparse
+import contextlib
+import importlib
 import pandas as pd
 from dotenv import load_dotenv
-import inspect
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich import print as rprint
 from datetime import datetime
 
-# Import the refactored function
-from altaz_stats_calculator import generate_altaz_stats_df
-from phd2_error_anaylsis import generate_phd2_analysis_data
-from autofocus_analysis import generate_event_dataframes
-from final_output.generate_unified_csv import generate_unified_dataframe
+try:
+    # Writes the zipped XML directly and is much faster than openpyxl for large sheets.
+    # (Its constant_memory mode can't be used: pandas writes cells column by column,
+    # and constant_memory only accepts row-ordered writes.)
+    import xlsxwriter  # noqa: F401
+    excel_engine = 'xlsxwriter'
+except ImportError:  # fall back to the previous engine
+    excel_engine = 'openpyxl'
+
+# Stage generators, imported on first use: the stage modules pull in astropy, numpy etc.,
+# so a stage left out with --only never pays for its imports. (Modules loaded once stay in
+# sys.modules and are shared by the later stages.)
+STAGES = {
+    "altaz": ("altaz_stats_calculator", "generate_altaz_stats_df"),
+    "phd2": ("phd2_error_anaylsis", "generate_phd2_analysis_data"),
+    "autofocus": ("autofocus_analysis", "generate_event_dataframes"),
+    "unified": ("final_output.generate_unified_csv", "generate_unified_dataframe"),
+}
+
+
+def load_stage(name):
+    """Return the generator function of stage *name*, importing its module if needed."""
+    module_name, func_name = STAGES[name]
+    return getattr(importlib.import_module(module_name), func_name)
 
 # Initialize rich console
 console = Console()
 
+
+def maybe_status(message):
+    """console.status spinner on a terminal. When output is piped (cron, CI) the message is
+    printed once instead, since the spinner thread would only repaint escape sequences into a log."""
+    if console.is_terminal:
+        return console.status(message)
+    console.print(message)
+    return contextlib.nullcontext()
+
 # Parse command-line arguments
 parser = argparse.ArgumentParser(description="Run all astro-session reporters.")
 parser.add_argument('--debug', action='store_true', help='Enable debug output')
 parser.add_argument('--reports-dir', help='Override REPORTS_DIR environment variable')
+parser.add_argument('--parquet', action='store_true',
+                    help='Also write each sheet as a Parquet file (needs pyarrow)')
+parser.add_argument('--no-excel', action='store_true', help='Skip the Excel workbook')
+parser.add_argument('--only', help=f"Comma-separated stages to run ({', '.join(STAGES)}); default: all")
 args = parser.parse_args()
 
+selected_stages = set(STAGES)
+if args.only:
+    selected_stages = {name.strip() for name in args.only.split(",") if name.strip()}
+    unknown = selected_stages - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s) for --only: {', '.join(sorted(unknown))}")
+
 # Display title - use a wider panel with explicit width
 title_panel = Panel(
     "[bold blue]Astro Session Reporter[/]",
@@ -36,7 +77,7 @@ title_panel = Panel(
 console.print(title_panel, justify="center")
 
 # Calculate path to the parent directory where .env is stored
-script_path = os.path.abspath(inspect.getfile(inspect.currentframe()))
+script_path = os.path.abspath(__file__)
 script_dir = os.path.dirname(script_path)
 parent_dir = os.path.dirname(script_dir)
 env_path = os.path.join(parent_dir, ".env")
@@ -86,17 +127,22 @@ all_scripts_display_names = [
     os.path.join("final_output", "generate_unified_csv.py"),
 ]
 
-# Create a table to track script execution status
-status_table = Table(title="Script Execution Status")
-status_table.add_column("Script", style="cyan")
-status_table.add_column("Status", style="green")
-
 # Track statuses separately
 statuses = {name: "Pending" for name in all_scripts_display_names}
-for script_name in all_scripts_display_names:
-    status_table.add_row(script_name, statuses[script_name])
+SKIPPED_STATUS = "[dim]Skipped (--only)[/dim]"
+
+def _status_table():
+    """Script execution status table, built from the current ``statuses``."""
+    table = Table(title="Script Execution Status")
+    table.add_column("Script", style="cyan")
+    table.add_column("Status")
+    for script_name in all_scripts_display_names:
+        table.add_row(script_name, statuses[script_name])
+    return table
 
-console.print(status_table)
+# One status view redrawn in place while the scripts run (stage output scrolls above it),
+# instead of printing the whole table again for every update
+status_live = Live(get_renderable=_status_table, console=console, refresh_per_second=4, transient=True)
 
 # Prepare environment for subprocess calls - ensure BOTH dirs are passed
 env_vars = {**os.environ, "RAW_DIR": raw_dir}
@@ -109,13 +155,33 @@ if args.debug:
     env_vars["DEBUG"] = "1"
     console.print("[bold yellow]Debug mode enabled[/]")
 
+# --- 0. Index FITS headers once for the generators below ---
+# PHD2 analysis and the unified report both need the same primary headers; read them
+# in one pass here instead of once per generator. (Alt/Az stats still open every file,
+# since it needs the pixel data for HFR/background statistics.)
+fits_index = None
+if selected_stages & {"phd2", "unified"}:
+    try:
+        with maybe_status("[bold green]Indexing FITS headers...[/]"):
+            from shared.fits_index import build_fits_index
+            fits_index = build_fits_index(raw_dir)
+        console.print(f"Indexed [green]{len(fits_index)}[/] FITS header(s)")
+    except Exception as e:
+        console.print(f"[yellow]WARNING: could not index FITS headers ({e}); generators will read them individually.[/]")
+
+if console.is_terminal:  # likewise no in-place view (or its refresh thread) when piped
+    status_live.start()
+
 # --- 1. Run Alt/Az Stats Calculator --- 
 script_name_altaz = "altaz_stats_calculator.py"
-console.print(f"\n[bold blue]=== Running {script_name_altaz} (imported) ===[/]")
-try:
-    with console.status(f"[bold green]Running {script_name_altaz}...[/]"):
-        altaz_df, first_fits_header_df = generate_altaz_stats_df()
-        
+if "altaz" not in selected_stages:
+    statuses[script_name_altaz] = SKIPPED_STATUS
+else:
+    statuses[script_name_altaz] = "[yellow]Running[/yellow]"
+    console.print(f"\n[bold blue]=== Running {script_name_altaz} (imported) ===[/]")
+    try:
+        altaz_df, first_fits_header_df = load_stage("altaz")()
+    
         # Process AltAz Stats DF
         if not altaz_df.empty:
             excel_sheets_data["AltAz_Stats"] = altaz_df
@@ -125,7 +191,7 @@ try:
                 console.print(altaz_df.head().to_string())
         else:
             console.print(f"[yellow]  -> {script_name_altaz} (Stats) completed but returned an empty DataFrame.[/]")
-        
+    
         # Process First FITS Header DF
         if not first_fits_header_df.empty:
             excel_sheets_data["First_FITS_Header"] = first_fits_header_df
@@ -137,17 +203,20 @@ try:
              console.print(f"[yellow]  -> {script_name_altaz} (First FITS Header) completed but returned an empty DataFrame.[/]")
 
         statuses[script_name_altaz] = "[green]Completed Successfully (Imported)[/green]"
-except Exception as e:
-    console.print(f"[bold red][ERROR][/] running {script_name_altaz} (imported): {e}")
-    statuses[script_name_altaz] = f"[red]Failed (Imported): {e}[/red]"
+    except Exception as e:
+        console.print(f"[bold red][ERROR][/] running {script_name_altaz} (imported): {e}")
+        statuses[script_name_altaz] = f"[red]Failed (Imported): {e}[/red]"
 
 # --- 2. Run PHD2 Error Analysis --- 
 script_name_phd2 = "phd2_error_anaylsis.py"
-console.print(f"\n[bold blue]=== Running {script_name_phd2} (imported) ===[/]")
-try:
-    with console.status(f"[bold green]Running {script_name_phd2}...[/]"):
-        phd2_results_df, phd2_summary_df, first_phd2_header_df = generate_phd2_analysis_data()
-        
+if "phd2" not in selected_stages:
+    statuses[script_name_phd2] = SKIPPED_STATUS
+else:
+    statuses[script_name_phd2] = "[yellow]Running[/yellow]"
+    console.print(f"\n[bold blue]=== Running {script_name_phd2} (imported) ===[/]")
+    try:
+        phd2_results_df, phd2_summary_df, first_phd2_header_df = load_stage("phd2")(fits_index)
+    
         # Process PHD2 Per Image Stats DF
         if not phd2_results_df.empty:
             excel_sheets_data["PHD2_Per_Image_Stats"] = phd2_results_df
@@ -167,7 +236,7 @@ try:
                 console.print(phd2_summary_df.to_string())
         else:
             console.print(f"[yellow]  -> {script_name_phd2} (Overall Summary) completed but returned an empty DataFrame.[/]")
-        
+    
         # Process First PHD2 Header DF
         if not first_phd2_header_df.empty:
             excel_sheets_data["PHD2_Log_Header"] = first_phd2_header_df
@@ -179,16 +248,19 @@ try:
             console.print(f"[yellow]  -> {script_name_phd2} (PHD2 Log Header) completed but returned an empty DataFrame.[/]")
 
         statuses[script_name_phd2] = "[green]Completed Successfully (Imported)[/green]"
-except Exception as e:
-    console.print(f"[bold red][ERROR][/] running {script_name_phd2} (imported): {e}")
-    statuses[script_name_phd2] = f"[red]Failed (Imported): {e}[/red]"
+    except Exception as e:
+        console.print(f"[bold red][ERROR][/] running {script_name_phd2} (imported): {e}")
+        statuses[script_name_phd2] = f"[red]Failed (Imported): {e}[/red]"
 
 # --- 3. Run Autofocus Analysis (Event Extraction) --- 
 script_name_autofocus = "autofocus_analysis.py"
-console.print(f"\n[bold blue]=== Running {script_name_autofocus} (imported) ===[/]")
-try:
-    with console.status(f"[bold green]Running {script_name_autofocus}...[/]"):
-        event_dfs_dict = generate_event_dataframes()
+if "autofocus" not in selected_stages:
+    statuses[script_name_autofocus] = SKIPPED_STATUS
+else:
+    statuses[script_name_autofocus] = "[yellow]Running[/yellow]"
+    console.print(f"\n[bold blue]=== Running {script_name_autofocus} (imported) ===[/]")
+    try:
+        event_dfs_dict = load_stage("autofocus")()
         if event_dfs_dict:
             console.print(f"[green]  -> {script_name_autofocus} completed. Found {len(event_dfs_dict)} event types.[/]")
             for event_type, df in event_dfs_dict.items():
@@ -204,25 +276,28 @@ try:
         else:
             console.print(f"[yellow]  -> {script_name_autofocus} completed but returned no event DataFrames.[/]")
         statuses[script_name_autofocus] = "[green]Completed Successfully (Imported)[/green]"
-except Exception as e:
-    console.print(f"[bold red][ERROR][/] running {script_name_autofocus} (imported): {e}")
-    statuses[script_name_autofocus] = f"[red]Failed (Imported): {e}[/red]"
+    except Exception as e:
+        console.print(f"[bold red][ERROR][/] running {script_name_autofocus} (imported): {e}")
+        statuses[script_name_autofocus] = f"[red]Failed (Imported): {e}[/red]"
 
 # --- 4. Run Unified CSV Generation --- 
 script_name_unified = os.path.join("final_output", "generate_unified_csv.py")
 # Normalize display name for dictionary key consistency
 script_display_name_unified = os.path.normpath(script_name_unified)
+if "unified" not in selected_stages:
+    statuses[script_display_name_unified] = SKIPPED_STATUS
+else:
+    statuses[script_display_name_unified] = "[yellow]Running[/yellow]"
 
-console.print(f"\n[bold blue]=== Running {script_display_name_unified} (imported) ===[/]")
-try:
-    with console.status(f"[bold green]Running {script_display_name_unified}...[/]"):
+    console.print(f"\n[bold blue]=== Running {script_display_name_unified} (imported) ===[/]")
+    try:
         # The RAW_DIR for generate_unified_dataframe will be implicitly set 
         # by the environment variable passed from run_all.py to its child processes/imports.
         # If generate_unified_dataframe needs specific data from other DFs collected in run_all.py,
         # those would need to be passed as arguments here.
         # For now, it does its own parsing based on RAW_DIR.
-        unified_df = generate_unified_dataframe(raw_dir_override=raw_dir) # Pass raw_dir explicitly
-        
+        unified_df = load_stage("unified")(raw_dir_override=raw_dir, fits_index=fits_index) # Pass raw_dir explicitly
+    
         if not unified_df.empty:
             excel_sheets_data["Unified_Report"] = unified_df
             console.print(f"[green]  -> {script_display_name_unified} completed. DataFrame shape: {unified_df.shape}[/]")
@@ -232,9 +307,9 @@ try:
         else:
             console.print(f"[yellow]  -> {script_display_name_unified} completed but returned an empty DataFrame.[/]")
         statuses[script_display_name_unified] = "[green]Completed Successfully (Imported)[/green]"
-except Exception as e:
-    console.print(f"[bold red][ERROR][/] running {script_display_name_unified} (imported): {e}")
-    statuses[script_display_name_unified] = f"[red]Failed (Imported): {e}[/red]"
+    except Exception as e:
+        console.print(f"[bold red][ERROR][/] running {script_display_name_unified} (imported): {e}")
+        statuses[script_display_name_unified] = f"[red]Failed (Imported): {e}[/red]"
 
 # --- Run other scripts as subprocesses (for now) ---
 # This loop should now be empty if all scripts are refactored
@@ -242,24 +317,26 @@ if scripts_to_run_as_subprocess:
     console.print("\n[bold yellow]Warning: Some scripts are still configured to run as subprocesses.[/]")
 for script_path_segment in scripts_to_run_as_subprocess:
     script_display_name = os.path.normpath(script_path_segment) # Normalize for consistent dict key
-    with console.status(f"[bold green]Running {script_display_name}...[/]"):
-        console.print(f"\n[bold blue]=== Running {script_display_name} (subprocess) ===[/]")
-        try:
-            # Use full path to script
-            full_script_path = os.path.join(script_dir, script_path_segment)
-            subprocess.run([sys.executable, full_script_path], env=env_vars, check=True, capture_output=True, text=True)
-            statuses[script_display_name] = "[green]Completed Successfully (Subprocess)[/green]"
-        except subprocess.CalledProcessError as exc:
-            console.print(f"[bold red][ERROR][/] {script_display_name} exited with status {exc.returncode}")
-            console.print(f"  Stdout:\n{exc.stdout}")
-            console.print(f"  Stderr:\n{exc.stderr}")
-            statuses[script_display_name] = f"[red]Failed (Subprocess - Exit Code: {exc.returncode})[/red]"
-            # Continue to next script rather than aborting the entire pipeline
-            continue
-        except Exception as e:
-            console.print(f"[bold red][ERROR][/] An unexpected error occurred with {script_display_name}: {e}")
-            statuses[script_display_name] = f"[red]Failed (Subprocess - Unexpected Error)[/red]"
-            continue
+    statuses[script_display_name] = "[yellow]Running (Subprocess)[/yellow]"
+    console.print(f"\n[bold blue]=== Running {script_display_name} (subprocess) ===[/]")
+    try:
+        # Use full path to script
+        full_script_path = os.path.join(script_dir, script_path_segment)
+        subprocess.run([sys.executable, full_script_path], env=env_vars, check=True, capture_output=True, text=True)
+        statuses[script_display_name] = "[green]Completed Successfully (Subprocess)[/green]"
+    except subprocess.CalledProcessError as exc:
+        console.print(f"[bold red][ERROR][/] {script_display_name} exited with status {exc.returncode}")
+        console.print(f"  Stdout:\n{exc.stdout}")
+        console.print(f"  Stderr:\n{exc.stderr}")
+        statuses[script_display_name] = f"[red]Failed (Subprocess - Exit Code: {exc.returncode})[/red]"
+        # Continue to next script rather than aborting the entire pipeline
+        continue
+    except Exception as e:
+        console.print(f"[bold red][ERROR][/] An unexpected error occurred with {script_display_name}: {e}")
+        statuses[script_display_name] = f"[red]Failed (Subprocess - Unexpected Error)[/red]"
+        continue
+
+status_live.stop()
 
 # --- TODO: Implement Excel Writing --- 
 if excel_sheets_data:
@@ -280,23 +357,39 @@ if excel_sheets_data:
     
     output_excel_path = os.path.join(output_excel_dir, excel_filename)
 
-    try:
-        with pd.ExcelWriter(output_excel_path, engine='openpyxl') as writer:
-            for sheet_name, df_to_write in excel_sheets_data.items():
-                df_to_write.to_excel(writer, sheet_name=sheet_name, index=False)
-        console.print(f"\n[bold green]SUCCESS:[/] Excel report generated at: [cyan]{output_excel_path}[/]")
-    except Exception as e:
-        console.print(f"\n[bold red]ERROR writing Excel file {output_excel_path}: {e}[/]")
+    if not args.no_excel:
+        try:
+            with pd.ExcelWriter(output_excel_path, engine=excel_engine) as writer:
+                for sheet_name, df_to_write in excel_sheets_data.items():
+                    df_to_write.to_excel(writer, sheet_name=sheet_name, index=False)
+            console.print(f"\n[bold green]SUCCESS:[/] Excel report generated at: [cyan]{output_excel_path}[/]")
+        except Exception as e:
+            console.print(f"\n[bold red]ERROR writing Excel file {output_excel_path}: {e}[/]")
     # --- 
 
-# Display final status
-final_table = Table(title="Script Execution Status")
-final_table.add_column("Script", style="cyan")
-final_table.add_column("Status")
-
-for script_name_disp in all_scripts_display_names:
-    final_table.add_row(script_name_disp, statuses[script_name_disp])
+    # --- Parquet (one columnar file per sheet, much faster to write and reload than XLSX) ---
+    if args.parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            console.print("[bold red]ERROR:[/] --parquet needs pyarrow (pip install pyarrow); no Parquet files written")
+        else:
+            parquet_dir = os.path.splitext(output_excel_path)[0] + "_parquet"
+            os.makedirs(parquet_dir, exist_ok=True)
+            parquet_failures = 0
+            for sheet_name, df_to_write in excel_sheets_data.items():
+                parquet_path = os.path.join(parquet_dir, f"{sheet_name}.parquet")
+                try:
+                    df_to_write.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+                except Exception as e:
+                    console.print(f"[bold red]ERROR writing Parquet file {parquet_path}: {e}[/]")
+                    parquet_failures += 1
+            if parquet_failures:
+                console.print(f"[bold red]ERROR:[/] {parquet_failures} of {len(excel_sheets_data)} Parquet sheet(s) failed; see above")
+            else:
+                console.print(f"[bold green]SUCCESS:[/] Parquet sheets written to: [cyan]{parquet_dir}[/]")
 
+# Display final status
 console.print("\n[bold green]Final Status:[/]")
-console.print(final_table)
+console.print(_status_table())
 console.print("\n[bold green]All processing complete![/]") 
\ No newline at end of file
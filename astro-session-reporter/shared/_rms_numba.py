@@ -0,0 +1,66 @@
+"""
+Module: _rms_numba
+
+Fused RMS kernels for guide-frame offsets. When numba is installed the kernels are
+JIT-compiled (single pass, no temporaries, multi-threaded for whole-session arrays);
+otherwise an equivalent NumPy version is used. Offsets may be float32; the sums of
+squares are always accumulated in float64.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+    # Below this many frames thread start-up costs more than the reduction itself
+    PARALLEL_MIN_FRAMES = 1 << 16
+
+    @njit(cache=True, fastmath=True)
+    def _sums_serial(ra, dec):
+        s_ra = 0.0
+        s_dec = 0.0
+        for i in range(ra.shape[0]):
+            r = np.float64(ra[i])
+            d = np.float64(dec[i])
+            s_ra += r * r
+            s_dec += d * d
+        return s_ra, s_dec
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _sums_parallel(ra, dec):
+        s_ra = 0.0
+        s_dec = 0.0
+        for i in prange(ra.shape[0]):
+            r = np.float64(ra[i])
+            d = np.float64(dec[i])
+            s_ra += r * r
+            s_dec += d * d
+        return s_ra, s_dec
+
+    def rms3(ra, dec, scale):
+        """Return (ra_rms, dec_rms, tot_rms) of *ra*/*dec* pixel offsets multiplied by *scale*."""
+        n = ra.shape[0]
+        sums = _sums_parallel if n >= PARALLEL_MIN_FRAMES else _sums_serial
+        s_ra, s_dec = sums(ra, dec)
+        m_ra = s_ra / n
+        m_dec = s_dec / n
+        return math.sqrt(m_ra) * scale, math.sqrt(m_dec) * scale, math.sqrt(m_ra + m_dec) * scale
+
+    # Warm the JITs (or load them from the on-disk cache) at import time
+    _sums_serial(np.zeros(1, np.float32), np.zeros(1, np.float32))
+    _sums_parallel(np.zeros(1, np.float32), np.zeros(1, np.float32))
+else:
+    def rms3(ra, dec, scale):
+        """Return (ra_rms, dec_rms, tot_rms) of *ra*/*dec* pixel offsets multiplied by *scale*."""
+        # einsum sums the squares in one pass, widening to float64 as it goes, without
+        # allocating ra*ra / dec*dec (a float32 dot() would also accumulate in float32)
+        n = ra.shape[0]
+        m_ra = float(np.einsum("i,i->", ra, ra, dtype=np.float64)) / n
+        m_dec = float(np.einsum("i,i->", dec, dec, dtype=np.float64)) / n
+        return math.sqrt(m_ra) * scale, math.sqrt(m_dec) * scale, math.sqrt(m_ra + m_dec) * scale
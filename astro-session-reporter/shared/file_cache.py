@@ -0,0 +1,52 @@
+"""
+Module: file_cache
+
+On-disk memo of per-file parse results, keyed by (path, mtime_ns, size) so a file is only
+re-parsed after it changes. The cache is a single versioned pickle written atomically.
+"""
+import os
+import pickle
+from pathlib import Path
+
+
+def file_key(fp):
+    """Cache key for *fp*; raises OSError if the file cannot be stat'ed."""
+    st = os.stat(fp)
+    return (str(Path(fp)), st.st_mtime_ns, st.st_size)
+
+
+def prune_stale(cache: dict, keep=()) -> dict:
+    """Drop entries whose file is gone or has changed since it was cached (in place).
+
+    Keys in *keep* (e.g. the ones the caller is about to read back) are left alone.
+    """
+    keep = set(keep)
+    for key in list(cache):
+        if key in keep:
+            continue
+        try:
+            current = file_key(key[0])
+        except OSError:
+            current = None
+        if current != key:
+            del cache[key]
+    return cache
+
+
+def load_cache(cache_path: str, version: int) -> dict:
+    try:
+        with open(cache_path, "rb") as fh:
+            stored_version, cache = pickle.load(fh)
+    except Exception:
+        return {}  # missing, unreadable or written by another version
+    return cache if stored_version == version else {}
+
+
+def save_cache(cache_path: str, cache: dict, version: int, tag: str = "file_cache"):
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            pickle.dump((version, cache), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as exc:
+        print(f"[{tag}] Cannot write cache {cache_path}: {exc}")
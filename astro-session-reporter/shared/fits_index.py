@@ -0,0 +1,68 @@
+"""
+Module: fits_index
+
+One pass over the primary headers of the FITS files in a raw directory, as a DataFrame
+(one row per readable file). run_all builds it once and hands it to the generators, so
+headers are not re-read by each of them.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from parsers.fits_parser import read_primary_header
+
+# Header keywords the generators read (including the alternates they fall back to)
+FITS_INDEX_KEYS = [
+    "DATE-OBS",
+    "EXPTIME",
+    "EXPOSURE",
+    "RA",
+    "DEC",
+    "ALT",
+    "ALT_DEG",
+    "AZ",
+    "AZ_DEG",
+    "MEAN_PIX",
+    "STD_PIX",
+]
+
+
+def _read_row(path):
+    try:
+        hdr = read_primary_header(path)
+    except Exception as exc:
+        print(f"[fits_index] Cannot read header for {path}: {exc}")
+        return None
+    return [hdr.get(key) for key in FITS_INDEX_KEYS]
+
+
+def build_fits_index(raw_dir) -> pd.DataFrame:
+    """Index the *.fit / *.fits files directly in *raw_dir*.
+
+    Columns are ``name``, ``path`` (absolute) and FITS_INDEX_KEYS; a keyword missing
+    from a header is None/NaN.
+    """
+    with os.scandir(raw_dir) as entries:
+        paths = sorted(
+            os.path.abspath(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith((".fit", ".fits"))
+        )
+
+    # Header reads are I/O bound, so overlap them across files
+    workers = min(len(paths), os.cpu_count() or 1)
+    if workers <= 1:
+        rows = [_read_row(p) for p in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_read_row, paths))
+
+    kept = [(p, row) for p, row in zip(paths, rows) if row is not None]
+    columns = {
+        "name": [os.path.basename(p) for p, _ in kept],
+        "path": [p for p, _ in kept],
+    }
+    for i, key in enumerate(FITS_INDEX_KEYS):
+        columns[key] = [row[i] for _, row in kept]
+    return pd.DataFrame(columns)
+
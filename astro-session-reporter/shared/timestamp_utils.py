@@ -4,20 +4,32 @@ Module: timestamp_utils
 Utilities for parsing timestamps from multiple sources (FITS headers, log files), normalizing them to UTC, and providing comparison helpers.
 """
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 import re
 from typing import Optional
 
+import numpy as np
+
+try:
+    # C ISO-8601 parser; returns aware datetimes for "Z"/offset stamps
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:  # ciso8601 is optional
+    _parse_iso = None
+
 ISO_PAT = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z)?$")
 
 LOG_PAT_SLASH = "%Y/%m/%d %H:%M:%S"
 LOG_PAT_DASH  = "%Y-%m-%d %H:%M:%S"
+# Both log layouts above in one match (same separator throughout the date)
+LOG_RE = re.compile(r"^(\d{4})([/-])(\d{1,2})\2(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})$")
 
 
-def _try_parse(fmt: str, value: str):
-    try:
-        return datetime.strptime(value, fmt)
-    except ValueError:
-        return None
+def parse_log_time(value: str) -> datetime:
+    """Parse a ``YYYY/MM/DD HH:MM:SS`` or ``YYYY-MM-DD HH:MM:SS`` log stamp (naive).
+
+    Uses ``fromisoformat``, which is much cheaper than ``strptime`` for these fixed layouts.
+    """
+    return datetime.fromisoformat(value.replace("/", "-"))
 
 
 def parse_any(ts: str, guiding_start: Optional[datetime] = None):
@@ -28,27 +40,32 @@ def parse_any(ts: str, guiding_start: Optional[datetime] = None):
     """
     if ts is None:
         return None
+    # Stamps repeat heavily (many frames/events per second, the same headers across
+    # runs); datetimes are immutable, so cached results can be shared
+    return _parse_any(ts, guiding_start)
+
 
+@lru_cache(maxsize=1 << 16)
+def _parse_any(ts: str, guiding_start: Optional[datetime]):
     ts = ts.strip()
 
     # 1) ISO 8601 (DATE-OBS) – assume already UTC when endswith Z or treat naive as UTC.
     if ISO_PAT.match(ts):
-        dt = datetime.fromisoformat(ts.replace("Z", ""))
+        dt = _parse_iso(ts) if _parse_iso is not None else datetime.fromisoformat(ts.replace("Z", ""))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
 
-    # 2) Slash log format
-    dt = _try_parse(LOG_PAT_SLASH, ts)
-    if dt:
-        return dt.replace(tzinfo=timezone.utc)  # treat NINA local as UTC for now (TODO)
-
-    # 3) Dash log format
-    dt = _try_parse(LOG_PAT_DASH, ts)
-    if dt:
-        return dt.replace(tzinfo=timezone.utc)
+    # 2) Slash / dash log formats – treat NINA local as UTC for now (TODO)
+    m = LOG_RE.match(ts)
+    if m:
+        try:
+            return datetime(int(m[1]), int(m[3]), int(m[4]), int(m[5]), int(m[6]), int(m[7]),
+                            tzinfo=timezone.utc)
+        except ValueError:
+            pass  # out-of-range field, e.g. month 13
 
-    # 4) Seconds since guiding start
+    # 3) Seconds since guiding start
     if guiding_start:
         try:
             seconds = float(ts)
@@ -59,13 +76,53 @@ def parse_any(ts: str, guiding_start: Optional[datetime] = None):
     raise ValueError(f"Unrecognised timestamp: {ts}")
 
 
+# Layout kinds for parse_any_specialized (see sniff_timestamp_format)
+TS_GENERIC = 0  # anything parse_any accepts
+TS_LOG = 1      # fixed-width "YYYY/MM/DD HH:MM:SS" or "YYYY-MM-DD HH:MM:SS"
+
+
+def sniff_timestamp_format(ts: str) -> int:
+    """Return the layout kind of *ts*, for parsing further stamps of the same source."""
+    ts = ts.strip()
+    if len(ts) == 19 and not ISO_PAT.match(ts) and LOG_RE.match(ts):
+        return TS_LOG
+    return TS_GENERIC
+
+
+def parse_any_specialized(fmt_kind: int, ts: str):
+    """:func:`parse_any` for a stamp known to be in layout *fmt_kind*.
+
+    A log file writes every stamp the same way, so callers sniff the first one and pass
+    its kind here; TS_LOG stamps are then sliced at fixed offsets without the regex
+    chain. Anything that does not fit the layout falls back to parse_any.
+    """
+    if fmt_kind == TS_LOG and len(ts) == 19:
+        try:
+            return datetime(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                            int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return parse_any(ts)
+
+
 def to_utc(dt: datetime):
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
+def to_datetime64(dt: datetime) -> np.datetime64:
+    """Convert *dt* to a naive-UTC ``datetime64[us]`` (naive input is treated as UTC)."""
+    return np.datetime64(to_utc(dt).replace(tzinfo=None), "us")
+
+
 def within(dt1: datetime, dt2: datetime, tolerance_seconds: float = 2.0):
     """Return True if *dt1* and *dt2* differ by <= tolerance_seconds."""
     delta = abs((to_utc(dt1) - to_utc(dt2)).total_seconds())
-    return delta <= tolerance_seconds 
\ No newline at end of file
+    return delta <= tolerance_seconds
+
+
+def within_vec(a: np.ndarray, b: np.ndarray, tolerance_seconds: float = 2.0) -> np.ndarray:
+    """Elementwise :func:`within` for ``datetime64`` arrays (naive UTC, broadcast together)."""
+    tol = np.timedelta64(round(tolerance_seconds * 1_000_000), "us")
+    return np.abs(np.asarray(a, dtype="datetime64[us]") - np.asarray(b, dtype="datetime64[us]")) <= tol 
\ No newline at end of file
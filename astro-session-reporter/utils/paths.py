@@ -1,7 +1,6 @@
 # astro_session_reporter/utils/paths.py
 import os
 import sys
-from pathlib import Path
 from dotenv import load_dotenv
 
 # For astro-scripts, the .env file is expected to be in the parent directory 
@@ -12,16 +11,30 @@ script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # astr
 parent_dir = os.path.dirname(script_dir)  # astro-scripts
 env_path = os.path.join(parent_dir, ".env")
 
-# Load environment variables from the precise .env location
-env_loaded = load_dotenv(dotenv_path=env_path)
-
-# Debug output
-print(f"[paths] Loading .env from: {env_path} (success: {env_loaded})")
+# Load environment variables from the precise .env location. load_dotenv never overrides
+# variables that are already set, so the file is only skipped when it cannot change
+# anything: every variable read below is already set, or this is a run_all subprocess
+# (FORCE_REPORTS_DIR), which inherits the environment run_all loaded from this .env
+_ENV_KEYS = ("RAW_DIR", "REPORTS_DIR", "DEBUG")
+env_preloaded = bool(os.getenv("FORCE_REPORTS_DIR")) or all(key in os.environ for key in _ENV_KEYS)
+env_loaded = env_preloaded or load_dotenv(dotenv_path=env_path)
+
+# DEBUG is read once (after .env, which may set it) rather than on every out_path call
+_DEBUG = os.getenv("DEBUG")
+
+# Debug output (every generator imports this module, so keep the success path quiet)
+if _DEBUG:
+    if env_preloaded:
+        print(f"[paths] Environment already configured; not loading {env_path}")
+    else:
+        print(f"[paths] Loading .env from: {env_path} (success: {env_loaded})")
 if not env_loaded:
     print(f"[paths] WARNING: Could not load .env file from {env_path}")
     # Fallback - try current directory
     env_loaded = load_dotenv()
-    print(f"[paths] Fallback load from current directory: {env_loaded}")
+    _DEBUG = os.getenv("DEBUG")
+    if _DEBUG:
+        print(f"[paths] Fallback load from current directory: {env_loaded}")
 
 # -----------------------------------------------------------------------------
 # Path helper for the astro-session-reporter package.
@@ -47,23 +60,20 @@ RAW_DIR = os.getenv("RAW_DIR", _legacy_raw_dir)
 # the original code did.
 raw_reports_dir = os.getenv("REPORTS_DIR", RAW_DIR)
 
-# Robust path normalization using pathlib
+# Path normalization: expand ~ and make absolute. This is string manipulation only;
+# unlike Path.resolve() it does not stat each component to follow symlinks, which
+# nothing here needs.
 def normalize_path(p):
     if not p:
         return None
-    try:
-        resolved = Path(p).expanduser().resolve(strict=False)
-        return str(resolved)
-    except Exception as e:
-        print(f"[paths] WARNING: Could not normalize path '{p}': {e}")
-        return os.path.abspath(p)
+    return os.path.abspath(os.path.expanduser(p))
 
 RAW_DIR_RAW = RAW_DIR
 REPORTS_DIR_RAW = raw_reports_dir
 RAW_DIR = normalize_path(RAW_DIR_RAW)
 REPORTS_DIR = normalize_path(REPORTS_DIR_RAW)
 
-if os.getenv("DEBUG"):
+if _DEBUG:
     print(f"[paths] RAW_DIR (raw): {RAW_DIR_RAW}")
     print(f"[paths] RAW_DIR (normalized): {RAW_DIR}")
     print(f"[paths] REPORTS_DIR (raw): {REPORTS_DIR_RAW}")
@@ -73,8 +83,16 @@ if os.getenv("DEBUG"):
 # Public helpers
 # -----------------------------------------------------------------------------
 
+# Directory ensure_reports_dir() created (REPORTS_DIR or its fallback); set on the
+# first call so later calls skip the makedirs/stat round trip
+_reports_dir_created = None
+
+
 def ensure_reports_dir() -> str:
     """Create the REPORTS_DIR (if needed) and return its absolute path."""
+    global _reports_dir_created
+    if _reports_dir_created is not None:
+        return _reports_dir_created
     if REPORTS_DIR is None:
         raise ValueError("REPORTS_DIR is not set")
     
@@ -86,8 +104,10 @@ def ensure_reports_dir() -> str:
         fallback_dir = os.path.join(os.getcwd(), "output")
         print(f"[paths] Using fallback directory: {fallback_dir}")
         os.makedirs(fallback_dir, exist_ok=True)
+        _reports_dir_created = fallback_dir
         return fallback_dir
         
+    _reports_dir_created = REPORTS_DIR
     return REPORTS_DIR
 
 
@@ -96,7 +116,7 @@ def out_path(filename: str) -> str:
     # Use an absolute path if REPORTS_DIR is explicitly set
     output_path = os.path.join(ensure_reports_dir(), filename)
     # Only print path for debugging
-    if os.getenv("DEBUG") == "1":
+    if _DEBUG == "1":
         print(f"[paths] Writing to: {output_path}")
     return output_path
 
@@ -1,15 +1,24 @@
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
+import numpy as np
+
+from shared.timestamp_utils import to_datetime64
+
 __all__ = [
     "ImageFrame",
-    "GuideFrame",
+    "GuideFrames",
     "GuideEvent",
     "ExposureMeta",
 ]
 
-@dataclass
+# __slots__ instead of a per-instance __dict__: smaller objects and faster attribute
+# access. dataclass(slots=True) needs Python 3.10; older interpreters keep the __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class ImageFrame:
     fits_name: str
     start_dt_utc: datetime
@@ -22,19 +31,60 @@ class ImageFrame:
     mean_pix: float
     std_pix: float
 
-@dataclass
-class GuideFrame:
-    abs_dt_utc: datetime
-    ra_pix: float
-    dec_pix: float
+@dataclass(**_SLOTS)
+class GuideFrames:
+    """Guide frames stored column-wise, sorted by time.
+
+    abs_dt_utc is ``datetime64[us]`` (naive UTC); ra_pix / dec_pix are float32 (PHD2
+    logs offsets to three decimals, well within float32), and reductions over them
+    accumulate in float64.
+    """
+    abs_dt_utc: np.ndarray
+    ra_pix: np.ndarray
+    dec_pix: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "GuideFrames":
+        return cls(np.empty(0, dtype="datetime64[us]"), np.empty(0, np.float32), np.empty(0, np.float32))
+
+    @classmethod
+    def concat(cls, parts: List["GuideFrames"]) -> "GuideFrames":
+        """Merge *parts* (e.g. one per log file) into a single time-sorted GuideFrames."""
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            abs_dt, ra_pix, dec_pix = parts[0].abs_dt_utc, parts[0].ra_pix, parts[0].dec_pix
+        else:
+            abs_dt = np.concatenate([p.abs_dt_utc for p in parts])
+            ra_pix = np.concatenate([p.ra_pix for p in parts])
+            dec_pix = np.concatenate([p.dec_pix for p in parts])
+        # Frames within a session, and sessions/logs themselves, normally arrive in time
+        # order, so an O(n) check usually saves the argsort and the three gathers
+        if abs_dt.size < 2 or not (abs_dt[1:] < abs_dt[:-1]).any():
+            return cls(abs_dt, ra_pix, dec_pix)
+        order = np.argsort(abs_dt, kind="stable")
+        return cls(abs_dt[order], ra_pix[order], dec_pix[order])
+
+    def __len__(self) -> int:
+        return self.ra_pix.shape[0]
+
+    def window(self, start: datetime, end: datetime) -> "GuideFrames":
+        """Return the frames with start <= abs_dt_utc <= end (views, no copy)."""
+        lo = np.searchsorted(self.abs_dt_utc, to_datetime64(start), side="left")
+        hi = np.searchsorted(self.abs_dt_utc, to_datetime64(end), side="right")
+        return self.slice(lo, hi)
+
+    def slice(self, lo: int, hi: int) -> "GuideFrames":
+        """Return frames ``[lo:hi]`` (views, no copy)."""
+        return GuideFrames(self.abs_dt_utc[lo:hi], self.ra_pix[lo:hi], self.dec_pix[lo:hi])
 
-@dataclass
+@dataclass(**_SLOTS)
 class GuideEvent:
     abs_dt_utc: datetime
     type: str
     details: str = ""
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExposureMeta:
     image_num: int
     fits_name: str
@@ -43,6 +93,6 @@ class ExposureMeta:
 
     # Convenience links (populated later)
     image_frame: Optional[ImageFrame] = None
-    guide_frames: List[GuideFrame] = field(default_factory=list)
+    guide_frames: GuideFrames = field(default_factory=GuideFrames.empty)
     guide_events: List[GuideEvent] = field(default_factory=list)
     confidence: float = 0.0 
\ No newline at end of file
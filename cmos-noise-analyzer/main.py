@@ -1,19 +1,63 @@
 import os
 import csv
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from modules.utilities import logger
 from modules.file_grouping import group_fits_files_by_parameters
 from modules.data_processing import process_group
+from modules._hist_numba import HAVE_NUMBA
 from modules.histogram_metrics import collect_histogram_metrics
+from modules.visualization import plot_histogram
 from modules import config  # Importing the configuration module
 
 
+def _init_worker():
+    """
+    Limits each worker process to one numba thread: the groups already occupy every core,
+    so a full thread pool per worker would oversubscribe the machine.
+    """
+    if HAVE_NUMBA:
+        import numba
+        numba.set_num_threads(1)
+
+
+def _process_one_group(key, file_list):
+    """
+    Processes one (GAIN, SET-TEMP) group and returns its metrics, or None if it is skipped.
+    Runs in a worker process, so it only computes; plotting and the CSV stay in main().
+    """
+    gain, set_temp = key
+    logger.info(f"\nProcessing group: GAIN={gain}, SET-TEMP={set_temp}, Number of files={len(file_list)}")
+
+    # Process the group to get cumulative pixel counts and average EGAIN
+    pixel_counts, average_egain = process_group(file_list)
+    if pixel_counts is None:
+        logger.warning(f"Skipping group GAIN={gain}, SET-TEMP={set_temp} due to missing EGAIN.")
+        return None
+
+    # Collect histogram metrics
+    metrics = collect_histogram_metrics(pixel_counts, average_egain)
+    if metrics is None:
+        logger.warning(f"Skipping group GAIN={gain}, SET-TEMP={set_temp} due to insufficient data.")
+        return None
+
+    # Add group info to the metrics
+    metrics['GAIN'] = gain
+    metrics['SET-TEMP'] = set_temp
+    return metrics
+
+
 def main():
     """
     Main function to process FITS files, compute histogram metrics, and generate outputs.
     """
     start_time = time.time()  # Start timer
 
+    # Plots are only written to files; never block on a window. Set here rather than at
+    # import so worker processes, which never plot, do not load matplotlib at all
+    import matplotlib
+    matplotlib.use('Agg')
+
     try:
         # Group FITS files by GAIN and SET-TEMP
         logger.info("Grouping FITS files by GAIN and SET-TEMP...")
@@ -22,31 +66,30 @@ def main():
         # List to store summary of metrics for each group
         summary_data = []
 
-        # Process each group
-        for (gain, set_temp), file_list in groups.items():
-            logger.info(f"\nProcessing group: GAIN={gain}, SET-TEMP={set_temp}, Number of files={len(file_list)}")
-
-            # Process the group to get cumulative pixel counts and average EGAIN
-            pixel_counts, average_egain = process_group(file_list)
-            if pixel_counts is None:
-                logger.warning(f"Skipping group GAIN={gain}, SET-TEMP={set_temp} due to missing EGAIN.")
-                continue
+        # Groups are independent, so process them in parallel worker processes
+        results = {}
+        workers = min(len(groups), os.cpu_count() or 1)
+        if workers <= 1:
+            for key, file_list in groups.items():
+                results[key] = _process_one_group(key, file_list)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = {executor.submit(_process_one_group, key, file_list): key
+                           for key, file_list in groups.items()}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
 
-            # Collect histogram metrics
-            metrics = collect_histogram_metrics(pixel_counts, average_egain)
+        # Keep the summary (and plots) in grouping order, whatever order the workers finished in
+        for (gain, set_temp) in groups:
+            metrics = results[(gain, set_temp)]
             if metrics is not None:
-                # Add group info to the metrics
-                metrics['GAIN'] = gain
-                metrics['SET-TEMP'] = set_temp
                 summary_data.append(metrics)
-            else:
-                logger.warning(f"Skipping group GAIN={gain}, SET-TEMP={set_temp} due to insufficient data.")
+                plot_histogram(metrics, gain, set_temp, config.PLOTS_DIRECTORY)
 
         # Save the summary data to CSV
         if summary_data:
             logger.info("\nSaving histogram metrics summary to CSV...")
             with open(config.SUMMARY_CSV_PATH, mode='w', newline='') as file:
-                writer = csv.writer(file)
                 headers = [
                     'GAIN',
                     'SET-TEMP',
@@ -57,20 +100,10 @@ def main():
                     'Median Electron Count',
                     'Std Electron Count'
                 ]
-                writer.writerow(headers)
-
-                for data in summary_data:
-                    row = [
-                        data['GAIN'],
-                        data['SET-TEMP'],
-                        data['Peak Frequency'],
-                        data['Peak Electron Count'],
-                        data['FWHM'],
-                        data['Mean Electron Count'],
-                        data['Median Electron Count'],
-                        data['Std Electron Count']
-                    ]
-                    writer.writerow(row)
+                # The metrics dicts also carry the histogram arrays; only the header columns are written
+                writer = csv.DictWriter(file, fieldnames=headers, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(summary_data)
 
             logger.info(f"Summary saved to {config.SUMMARY_CSV_PATH}")
 
@@ -0,0 +1,119 @@
+# _hist_numba.py
+
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional
+    HAVE_NUMBA = False
+
+# Number of 12-bit intensity bins
+HIST_BINS = 4096
+
+# BZERO of unsigned 16-bit FITS images (stored as signed int16 on disk)
+UINT16_BZERO = 32768
+
+
+def _accumulate_bincount(data, out):
+    out += np.bincount(np.right_shift(data.ravel(), 4), minlength=HIST_BINS)
+
+
+def _raw_hist12_bincount(raw):
+    # Read the stored bits as unsigned, keeping the byte order
+    unsigned = raw.view(raw.dtype.str.replace('i', 'u'))
+    return np.bincount(np.right_shift(unsigned.ravel(), 4), minlength=HIST_BINS)
+
+
+def _add_raw_hist12(counts, bzero, out):
+    # Adding BZERO=32768 to the raw bits (mod 2**16) flips the top bit, i.e. moves every
+    # 12-bit bin by half the range
+    if bzero == UINT16_BZERO:
+        counts = np.roll(counts, HIST_BINS // 2)
+    out += counts
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _hist12_chunks(flat, nchunks):
+        # One private histogram per chunk, so the threads never write to the same bins
+        local = np.zeros((nchunks, HIST_BINS), dtype=np.int64)
+        n = flat.shape[0]
+        step = (n + nchunks - 1) // nchunks
+        for c in prange(nchunks):
+            row = local[c]
+            for i in range(c * step, min(n, (c + 1) * step)):
+                row[flat[i] >> 4] += 1
+        return local.sum(axis=0)
+
+    @njit(cache=True, parallel=True)
+    def _hist12_be_chunks(raw8, nchunks):
+        # Same as _hist12_chunks, reading each big-endian pixel as its two bytes so the
+        # on-disk (memory-mapped) data is never byte-swapped into a copy
+        local = np.zeros((nchunks, HIST_BINS), dtype=np.int64)
+        n = raw8.shape[0] // 2
+        step = (n + nchunks - 1) // nchunks
+        for c in prange(nchunks):
+            row = local[c]
+            for i in range(c * step, min(n, (c + 1) * step)):
+                row[(np.int64(raw8[2 * i]) << 4) | (raw8[2 * i + 1] >> 4)] += 1
+        return local.sum(axis=0)
+
+    def accumulate_hist12(data, out):
+        """
+        Adds the 12-bit histogram (pixel value >> 4) of a 16-bit image to *out* in place.
+
+        Native uint16 frames go through a multi-threaded numba kernel that fuses the shift
+        into the counting pass; any other dtype (e.g. big-endian or signed) uses np.bincount.
+
+        Parameters:
+            data (array): Image data.
+            out (array): int64 histogram of length 4096 to accumulate into.
+        """
+        if data.dtype != np.uint16:
+            _accumulate_bincount(data, out)
+            return
+        out += _hist12_chunks(data.ravel(), numba.get_num_threads())
+
+    def accumulate_raw_hist12(raw, bzero, out):
+        """
+        Adds the 12-bit histogram of an unscaled 16-bit FITS image to *out* in place.
+
+        Parameters:
+            raw (array): int16/uint16 data as stored on disk
+                (``fits.open(..., do_not_scale_image_data=True)``).
+            bzero (float): The image's BZERO; 32768 for unsigned data, otherwise 0.
+            out (array): int64 histogram of length 4096 to accumulate into.
+        """
+        if raw.dtype.byteorder == '>' and raw.flags.c_contiguous:
+            counts = _hist12_be_chunks(np.asarray(raw).view(np.uint8).ravel(), numba.get_num_threads())
+        else:
+            counts = _raw_hist12_bincount(raw)
+        _add_raw_hist12(counts, bzero, out)
+
+    # Warm the JIT (or load it from the on-disk cache) at import time
+    _hist12_chunks(np.zeros(1, dtype=np.uint16), 1)
+    _hist12_be_chunks(np.zeros(2, dtype=np.uint8), 1)
+else:
+    def accumulate_hist12(data, out):
+        """
+        Adds the 12-bit histogram (pixel value >> 4) of a 16-bit image to *out* in place.
+
+        Parameters:
+            data (array): Image data.
+            out (array): int64 histogram of length 4096 to accumulate into.
+        """
+        _accumulate_bincount(data, out)
+
+    def accumulate_raw_hist12(raw, bzero, out):
+        """
+        Adds the 12-bit histogram of an unscaled 16-bit FITS image to *out* in place.
+
+        Parameters:
+            raw (array): int16/uint16 data as stored on disk
+                (``fits.open(..., do_not_scale_image_data=True)``).
+            bzero (float): The image's BZERO; 32768 for unsigned data, otherwise 0.
+            out (array): int64 histogram of length 4096 to accumulate into.
+        """
+        _add_raw_hist12(_raw_hist12_bincount(raw), bzero, out)
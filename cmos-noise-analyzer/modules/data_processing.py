@@ -3,7 +3,9 @@
 import os
 import numpy as np
 from astropy.io import fits
-from modules.utilities import get_header_value, logger
+from modules.utilities import logger
+# Parallel 12-bit histogram kernel (numba-compiled when available, np.bincount otherwise)
+from modules._hist_numba import HIST_BINS, UINT16_BZERO, accumulate_hist12, accumulate_raw_hist12
 
 def process_group(file_list):
     """
@@ -16,7 +18,8 @@ def process_group(file_list):
         cumulative_pixel_counts (array): Array of cumulative pixel counts.
         average_egain (float): Average EGAIN value across files.
     """
-    cumulative_pixel_counts = None
+    # One 12-bit histogram for the whole group, accumulated in place
+    cumulative_pixel_counts = np.zeros(HIST_BINS, dtype=np.int64)
     egain_values = []
 
     logger.info(f"Processing group with {len(file_list)} files.")
@@ -24,14 +27,16 @@ def process_group(file_list):
     for file_path in file_list:
         filename = os.path.basename(file_path)
         try:
-            with fits.open(file_path) as hdul:
+            # Memory-map the frame and keep the stored integers (no BZERO scaling into a
+            # full in-memory copy), so only the pages being counted are resident
+            with fits.open(file_path, memmap=True, lazy_load_hdus=True, do_not_scale_image_data=True) as hdul:
                 header = hdul[0].header
-                egain = get_header_value(header, ['EGAIN', 'EGAIN ', 'egain'])
+                egain = header.get('EGAIN')
                 if egain is None:
                     logger.warning(f"EGAIN not found in FITS header of file {filename}.")
                     continue  # Skip this file
 
-                egain = float(str(egain).strip())
+                egain = float(egain)
 
                 # Read image data
                 data = hdul[0].data
@@ -39,15 +44,16 @@ def process_group(file_list):
                     logger.warning(f"No image data found in file {filename}.")
                     continue  # Skip this file
 
-                # Convert from 16-bit to 12-bit space using bit-shift
-                pixel_values = data.flatten() >> 4  # Efficient bit-shift operation
-
-                # Update cumulative pixel counts using numpy bincount
-                counts = np.bincount(pixel_values, minlength=4096)
-                if cumulative_pixel_counts is None:
-                    cumulative_pixel_counts = counts
+                # Convert from 16-bit to 12-bit space using bit-shift and add the
+                # frame's counts to the cumulative histogram
+                bzero = header.get('BZERO', 0)
+                bscale = header.get('BSCALE', 1)
+                if data.dtype.kind == 'i' and data.dtype.itemsize == 2 and bscale == 1 and bzero == UINT16_BZERO:
+                    accumulate_raw_hist12(data, bzero, cumulative_pixel_counts)
                 else:
-                    cumulative_pixel_counts += counts
+                    # Anything but unsigned 16-bit: apply the scaling as astropy would have
+                    accumulate_hist12(data * bscale + bzero if (bzero, bscale) != (0, 1) else data,
+                                      cumulative_pixel_counts)
 
                 egain_values.append(egain)
 
@@ -1,8 +1,8 @@
 # file_grouping.py
 
 import os
-from astropy.io import fits
-from modules.utilities import get_header_value, logger
+from collections import defaultdict
+from modules.utilities import read_primary_header, logger
 
 def group_fits_files_by_parameters(directory_path, exptime_value):
     """
@@ -15,32 +15,34 @@ def group_fits_files_by_parameters(directory_path, exptime_value):
     Returns:
         dict: A dictionary where keys are (GAIN, SET-TEMP) tuples and values are lists of file paths.
     """
-    groups = {}
-    fits_files = [f for f in os.listdir(directory_path) if f.lower().endswith('.fits')]
-    logger.info(f"FITS files found: {fits_files}")
-
-    for filename in fits_files:
-        file_path = os.path.join(directory_path, filename)
+    groups = defaultdict(list)
+    # scandir yields each entry's name, full path and type from the one directory read
+    with os.scandir(directory_path) as entries:
+        fits_entries = [(entry.name, entry.path) for entry in entries
+                        if entry.name.lower().endswith('.fits') and entry.is_file()]
+    logger.info(f"FITS files found: {[filename for filename, _ in fits_entries]}")
+
+    for filename, file_path in fits_entries:
         try:
-            with fits.open(file_path) as hdul:
-                header = hdul[0].header
+            # Only the primary header is needed here; the image data is never read
+            header = read_primary_header(file_path)
 
-                # Extract header values
-                exptime = get_header_value(header, ['EXPTIME', 'EXPTIME ', 'exptime'])
-                gain = get_header_value(header, ['GAIN', 'GAIN ', 'gain'])
-                set_temp = get_header_value(header, ['SET-TEMP', 'SET-TEMP ', 'set-temp'])
+            # Extract header values
+            exptime = header.get('EXPTIME')
+            gain = header.get('GAIN')
+            set_temp = header.get('SET-TEMP')
 
-                # Convert to appropriate types
-                exptime = float(str(exptime).strip())
-                gain = float(str(gain).strip())
-                set_temp = float(str(set_temp).strip())
+            # Numeric cards are already int/float; float() also accepts whitespace-padded strings
+            exptime = float(exptime)
+            gain = float(gain)
+            set_temp = float(set_temp)
 
-                logger.info(f"Processing file: {filename}, EXPTIME={exptime}, GAIN={gain}, SET-TEMP={set_temp}")
+            logger.info(f"Processing file: {filename}, EXPTIME={exptime}, GAIN={gain}, SET-TEMP={set_temp}")
 
-                # Use a tolerance when comparing floating point numbers
-                if abs(exptime - exptime_value) < 1e-6:
-                    key = (gain, set_temp)
-                    groups.setdefault(key, []).append(file_path)
+            # Use a tolerance when comparing floating point numbers
+            if abs(exptime - exptime_value) < 1e-6:
+                key = (gain, set_temp)
+                groups[key].append(file_path)
 
         except (TypeError, ValueError) as e:
             logger.error(f"Error converting header values in file {filename}: {e}")
@@ -49,4 +51,4 @@ def group_fits_files_by_parameters(directory_path, exptime_value):
             logger.error(f"Error processing file {filename}: {e}")
 
     logger.info(f"Groups formed: {list(groups.keys())}")
-    return groups
\ No newline at end of file
+    return groups
@@ -2,7 +2,7 @@
 
 import numpy as np
 from scipy.optimize import curve_fit
-from modules.utilities import logger
+from modules.utilities import histogram_electron_counts, logger
 
 def gaussian(x, A, mu, sigma):
     """
@@ -17,7 +17,51 @@ def gaussian(x, A, mu, sigma):
     Returns:
         array: Gaussian function evaluated at x.
     """
-    return A * np.exp(-((x - mu) ** 2) / (2 * sigma ** 2))
+    # curve_fit evaluates this many times per fit: fold the constants into one scalar so
+    # each call is two array products instead of a power and a division
+    d = x - mu
+    return A * np.exp(d * d * (-0.5 / (sigma * sigma)))
+
+def _fit_log_parabola(x, frequencies):
+    """
+    Closed-form Gaussian fit: log(A·exp(-(x-mu)²/2σ²)) is a parabola in x, so one
+    weighted np.polyfit of log(frequencies) replaces the iterative solver.
+
+    Parameters:
+        x (array): Independent variable.
+        frequencies (array): Strictly positive counts at *x*.
+
+    Returns:
+        (popt, pcov): [A, mu, sigma] and their covariance, laid out like curve_fit's
+        result, or None when the data are not peaked inside their range or too few
+        points remain to estimate the covariance.
+    """
+    # var(log f) ~ 1/f for counts, so weight each residual by sqrt(f)
+    try:
+        coeffs, coeff_cov = np.polyfit(x, np.log(frequencies), 2, w=np.sqrt(frequencies), cov=True)
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    c2, c1, c0 = coeffs
+    if not c2 < 0:
+        return None
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        mu = -c1 / (2 * c2)
+        sigma = np.sqrt(-1 / (2 * c2))
+        A = np.exp(c0 - c1 * c1 / (4 * c2))
+
+        # Propagate the coefficient covariance: d(A, mu, sigma) / d(c2, c1, c0)
+        jac = np.array([
+            [A * c1 * c1 / (4 * c2 * c2), A * mu, A],
+            [c1 / (2 * c2 * c2), -1 / (2 * c2), 0.0],
+            [sigma ** 3, 0.0, 0.0],
+        ])
+        popt, pcov = np.array([A, mu, sigma]), jac @ coeff_cov @ jac.T
+
+    # A barely curved parabola (e.g. a monotonic histogram) puts the peak far outside the data
+    if not (np.all(np.isfinite(popt)) and np.all(np.isfinite(pcov)) and x.min() <= mu <= x.max()):
+        return None
+    return popt, pcov
 
 def fit_gaussian_and_collect_params(pixel_counts, egain):
     """
@@ -34,27 +78,22 @@ def fit_gaussian_and_collect_params(pixel_counts, egain):
         logger.warning("No pixel counts to process.")
         return None
 
-    # Calculate electron counts
-    intensities = np.arange(len(pixel_counts))
-    electron_counts = intensities * egain
-    frequencies = pixel_counts
-
-    # Filter out zero frequencies
-    mask = frequencies > 0
-    electron_counts = electron_counts[mask]
-    frequencies = frequencies[mask]
+    # Convert pixel intensities to electron counts, leaving out empty bins
+    electron_counts, frequencies = histogram_electron_counts(pixel_counts, egain)
 
     # Check if data is sufficient for fitting
     if len(electron_counts) < 3:
         logger.warning("Not enough data points for fitting.")
         return None
 
-    # Initial guesses for Gaussian fit
-    p0 = [np.max(frequencies), np.mean(electron_counts), np.std(electron_counts)]
-
     # Fit the histogram data to the Gaussian function
     try:
-        popt, pcov = curve_fit(gaussian, electron_counts, frequencies, p0=p0)
+        fit = _fit_log_parabola(electron_counts, frequencies)
+        if fit is None:
+            # Not Gaussian-shaped in log space; fall back to the iterative fit
+            p0 = [np.max(frequencies), np.mean(electron_counts), np.std(electron_counts)]
+            fit = curve_fit(gaussian, electron_counts, frequencies, p0=p0)
+        popt, pcov = fit
         A_fit, mu_fit, sigma_fit = popt
         perr = np.sqrt(np.diag(pcov))  # Standard errors
         amplitude_err, mean_err, sigma_err = perr
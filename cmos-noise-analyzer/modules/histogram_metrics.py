@@ -1,8 +1,7 @@
 #histogram_metrics.py
 
 import numpy as np
-from modules.utilities import logger
-import matplotlib.pyplot as plt
+from modules.utilities import histogram_electron_counts, logger
 
 
 def collect_histogram_metrics(pixel_counts, egain):
@@ -21,15 +20,8 @@ def collect_histogram_metrics(pixel_counts, egain):
         logger.warning("No pixel counts to process.")
         return None
 
-    # Convert pixel intensities to electron counts
-    intensities = np.arange(len(pixel_counts))
-    electron_counts = intensities * egain
-    frequencies = pixel_counts
-
-    # Filter out zero frequencies to avoid issues with empty data
-    mask = frequencies > 0
-    electron_counts = electron_counts[mask]
-    frequencies = frequencies[mask]
+    # Convert pixel intensities to electron counts, leaving out empty bins
+    electron_counts, frequencies = histogram_electron_counts(pixel_counts, egain)
 
     # Check if we have enough data points
     if len(electron_counts) < 3:
@@ -47,22 +39,27 @@ def collect_histogram_metrics(pixel_counts, egain):
     # Compute the FWHM (Full Width at Half Maximum)
     half_max = max_frequency / 2.0
 
-    # Find indices where frequencies cross the half_max level
-    # We look for the first point from left that surpasses half_max
-    # and the last point from right that is above half_max.
-    above_half_mask = frequencies >= half_max
-
-    # If we never cross half max, we can't compute FWHM
-    if np.sum(above_half_mask) < 2:
-        logger.warning("Unable to compute FWHM: Not enough data above half-maximum.")
-        fwhm = None
+    # Walk out from the peak to the first point below half_max on each side and
+    # interpolate linearly between it and its neighbour towards the peak, so the
+    # width is not snapped to whole bins. A side that never drops below half_max
+    # ends at its outermost point.
+    below_left = frequencies[peak_index::-1] < half_max
+    below_right = frequencies[peak_index:] < half_max
+    if below_left.any():
+        i = peak_index - np.argmax(below_left)
+        x_left = np.interp(half_max, [frequencies[i], frequencies[i + 1]],
+                           [electron_counts[i], electron_counts[i + 1]])
     else:
-        # The first and last points where frequencies are above half_max define the FWHM range
-        indices_above_half = np.where(above_half_mask)[0]
-        left_index = indices_above_half[0]
-        right_index = indices_above_half[-1]
-        fwhm = electron_counts[right_index] - electron_counts[left_index]
-        logger.info(f"FWHM: {fwhm}")
+        x_left = electron_counts[0]
+    if below_right.any():
+        i = peak_index + np.argmax(below_right)
+        # np.interp wants increasing sample points; frequencies fall from i - 1 to i
+        x_right = np.interp(half_max, [frequencies[i], frequencies[i - 1]],
+                            [electron_counts[i], electron_counts[i - 1]])
+    else:
+        x_right = electron_counts[-1]
+    fwhm = x_right - x_left
+    logger.info(f"FWHM: {fwhm}")
 
     # Compute additional metrics from the data distribution
     mean_electrons = np.mean(electron_counts)
@@ -73,16 +70,6 @@ def collect_histogram_metrics(pixel_counts, egain):
     logger.info(f"Median Electron Count: {median_electrons}")
     logger.info(f"Standard Deviation (Electron Counts): {std_electrons}")
 
-    # You may wish to plot the histogram for reference
-    plt.figure(figsize=(10, 6))
-    plt.scatter(electron_counts, frequencies, label="Data", color="blue", alpha=0.6)
-    plt.title("Histogram of Electron Counts")
-    plt.xlabel("Electron Counts (e-)")
-    plt.ylabel("Frequency Count")
-    plt.grid()
-    plt.legend()
-    plt.show()
-
     metrics = {
         'Peak Frequency': max_frequency,
         'Peak Electron Count': peak_electron_count,
@@ -1,24 +1,47 @@
 # utilities.py
 
 import logging
+import numpy as np
+from astropy.io import fits
+
+try:
+    import fitsio  # optional: C-level reader that only touches the requested HDU
+except ImportError:
+    fitsio = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger()
 
-def get_header_value(header, keys):
+def read_primary_header(file_path):
+    """
+    Reads only the primary header of a FITS file, without loading the image data.
+
+    Uses fitsio when installed, otherwise astropy's fits.getheader. Both headers
+    look keywords up case-insensitively, ignoring the card padding.
+
+    Parameters:
+        file_path (str): Path to the FITS file.
+
+    Returns:
+        header (fitsio.FITSHDR or fits.Header): The primary header.
+    """
+    if fitsio is not None:
+        return fitsio.read_header(file_path, 0)
+    return fits.getheader(file_path, ext=0)
+
+def histogram_electron_counts(pixel_counts, egain):
     """
-    Retrieves the value from a FITS header given a list of possible keys.
+    Converts a 12-bit histogram to its non-empty (electron count, frequency) points.
 
     Parameters:
-        header (fits.Header): FITS file header.
-        keys (list of str): Possible keys to search for in the header.
+        pixel_counts (array): Array of cumulative pixel counts (histogram).
+        egain (float): Average EGAIN value.
 
     Returns:
-        value (str or None): The value associated with the first found key, or None if not found.
+        electron_counts (array): Electron count of each non-empty bin.
+        frequencies (array): Pixel count of each non-empty bin.
     """
-    for key in keys:
-        value = header.get(key)
-        if value is not None:
-            return value
-    return None
\ No newline at end of file
+    # Index the non-empty bins once instead of building a full-length arange, product and mask
+    bins = np.flatnonzero(pixel_counts > 0)
+    return bins * egain, pixel_counts[bins]
@@ -1,10 +1,43 @@
 # visualization.py
 
 import os
-import matplotlib.pyplot as plt
 import numpy as np
 from modules.utilities import logger
 
+# matplotlib.pyplot is imported inside each plotting function: it is slow to import, and
+# code that only uses the other modules (or never plots) should not load it
+
+def plot_histogram(metrics, gain, set_temp, plots_directory):
+    """
+    Plots a group's electron-count histogram and saves it (the figure is closed afterwards).
+
+    Parameters:
+        metrics (dict): Histogram metrics from collect_histogram_metrics.
+        gain (float): GAIN value.
+        set_temp (float): SET-TEMP value.
+        plots_directory (str): Directory to save plots.
+
+    Returns:
+        str: Path to the saved plot.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.scatter(metrics['Electron Counts'], metrics['Frequencies'], label="Data", color="blue", alpha=0.6)
+    ax.set_title(f"Histogram of Electron Counts\nGAIN={gain}, SET-TEMP={set_temp}°C")
+    ax.set_xlabel("Electron Counts (e-)")
+    ax.set_ylabel("Frequency Count")
+    ax.grid()
+    ax.legend()
+
+    plot_filename = f"Histogram_GAIN_{gain}_SETTEMP_{set_temp}.png"
+    plot_path = os.path.join(plots_directory, plot_filename)
+    fig.savefig(plot_path, dpi=150)
+    plt.close(fig)
+    logger.info(f"Histogram plot saved to {plot_path}")
+
+    return plot_path
+
 def plot_fit_results(fit_params, gain, set_temp, plots_directory):
     """
     Plots the observed frequencies and fitted Gaussian, and saves the plot.
@@ -18,6 +51,8 @@ def plot_fit_results(fit_params, gain, set_temp, plots_directory):
     Returns:
         str: Path to the saved plot.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.scatter(fit_params['Electron Counts'], fit_params['Frequencies'],
                 color='blue', label='Observed Frequency')
@@ -49,6 +84,8 @@ def plot_overlay(overlay_data, plots_directory):
     Returns:
         str: Path to the saved overlay plot.
     """
+    import matplotlib.pyplot as plt
+
     if not overlay_data:
         logger.info("No data available for overlay plot.")
         return None
@@ -2,6 +2,7 @@
 import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Load environment variables from .env
@@ -20,9 +21,29 @@ scripts = [
     "astro-session-reporter/phd2_error_anaylsis.py",
 ]
 
-# Run each script with the same environment
-for script in scripts:
-    print(f"\n=== Running {script} ===")
-    # Pass the directory via environment variable for the sub-scripts
-    env_vars = {**os.environ, "DIRECTORY": directory}
-    subprocess.run([sys.executable, script], env=env_vars, check=True) 
\ No newline at end of file
+# Pass the directory via environment variable for the sub-scripts
+env_vars = {**os.environ, "DIRECTORY": directory}
+
+
+def run_script(script):
+    """Run one reporter script, capturing its output so parallel runs don't interleave."""
+    return subprocess.run([sys.executable, script], env=env_vars, capture_output=True, text=True)
+
+
+# The reporters share no state, so run them side by side (wall time ~ the slowest
+# script) and print each one's output as it finishes
+failed = []
+with ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+    futures = {pool.submit(run_script, script): script for script in scripts}
+    for future in as_completed(futures):
+        script = futures[future]
+        result = future.result()
+        print(f"\n=== {script} (exit code {result.returncode}) ===")
+        sys.stdout.write(result.stdout)
+        sys.stderr.write(result.stderr)
+        if result.returncode != 0:
+            failed.append(script)
+
+if failed:
+    print(f"\nERROR: {len(failed)} script(s) failed: {', '.join(failed)}")
+    sys.exit(1)